@@ -0,0 +1,365 @@
+"""
+Benchmarks of rendering ``wagtailseo/meta.html``, the ``{% seo_meta %}`` tag,
+and its Jinja2 equivalent, with cold and warm rendition caches, structured
+data on and off, and different numbers of sites. Also benchmarks serializing
+large structured data with each JSON backend, and importing
+``wagtailseo.models``.
+
+These are skipped unless ``WAGTAILSEO_BENCHMARK`` is set to the path of a JSON
+file to write the results to. ``WAGTAILSEO_BENCHMARK_SITES`` sets the numbers
+of sites to run with, default is ``1,10,1000``.
+"""
+
+import datetime
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import time
+from unittest import skipUnless
+
+import django
+import wagtail
+from django.contrib.auth.models import User
+from django.db import connection
+from django.template import engines
+from django.template.loader import render_to_string
+from django.test import RequestFactory
+from django.test import SimpleTestCase
+from django.test import TestCase
+from django.utils import timezone
+from wagtail.images import get_image_model
+from wagtail.images.tests.utils import Image
+from wagtail.images.tests.utils import get_test_image_file
+from wagtail.models import Page
+from wagtail.models import Site
+
+from home.models import ArticlePage
+from home.models import SeoPage
+from wagtailseo import schema
+from wagtailseo import utils
+from wagtailseo.meta import render_seo_meta
+from wagtailseo.models import SeoSettings
+from wagtailseo.timing import QueryCounter
+
+
+OUTPUT = os.environ.get("WAGTAILSEO_BENCHMARK")
+
+SITE_COUNTS = [
+    int(n)
+    for n in os.environ.get("WAGTAILSEO_BENCHMARK_SITES", "1,10,1000").split(
+        ","
+    )
+]
+
+# Number of sites, spread across all of them, on which pages are rendered.
+SAMPLE_SITES = 10
+
+# Number of times each page is rendered.
+ROUNDS = 10
+
+# Ways of rendering the metadata, by name.
+RENDERERS = {
+    "wagtailseo/meta.html": lambda context: render_to_string(
+        "wagtailseo/meta.html", context
+    ),
+    "{% seo_meta %}": lambda context: render_seo_meta(
+        context["self"], context["request"]
+    ),
+    "jinja2 {{ seo_meta() }}": lambda context: (
+        engines["jinja2"]
+        .from_string("{{ seo_meta() }}")
+        .render(context, context["request"])
+    ),
+}
+
+
+def get_commit():
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "HEAD"],
+            capture_output=True,
+            check=True,
+            text=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def summarize(timings, queries):
+    """
+    Summarizes render times, in seconds, and number of queries of each render.
+    """
+    timings = sorted(timings)
+    return {
+        "renders": len(timings),
+        "latency_ms": {
+            "mean": statistics.mean(timings) * 1000,
+            "median": statistics.median(timings) * 1000,
+            "p95": timings[int(len(timings) * 0.95) - 1] * 1000,
+            "max": timings[-1] * 1000,
+        },
+        "pages_per_second": len(timings) / sum(timings),
+        "queries_per_page": sum(queries) / len(queries),
+    }
+
+
+def save_results(name, results):
+    """
+    Saves ``results`` under ``name`` in the output file, keeping the results
+    of other benchmarks of the same commit.
+    """
+    if not OUTPUT:
+        return
+    try:
+        with open(OUTPUT, encoding="utf8") as f:
+            data = json.load(f)
+    except (OSError, ValueError):
+        data = {}
+    if data.get("commit") != get_commit():
+        data = {}
+    data.update(
+        {
+            "commit": get_commit(),
+            "date": timezone.now().isoformat(),
+            "python": platform.python_version(),
+            "django": django.get_version(),
+            "wagtail": wagtail.__version__,
+            "database": connection.vendor,
+            "rounds": ROUNDS,
+            name: results,
+        }
+    )
+    with open(OUTPUT, "w", encoding="utf8") as f:
+        json.dump(data, f, indent=2)
+
+
+@skipUnless(OUTPUT, "Set WAGTAILSEO_BENCHMARK to run benchmarks.")
+class MetaBenchmark(TestCase):
+    def setUp(self):
+        self.factory = RequestFactory()
+        self.owner = User.objects.create(
+            username="bench", first_name="Bench", last_name="Mark"
+        )
+        self.sites = list(Site.objects.order_by("pk"))
+        for site in self.sites:
+            self.configure_site(site)
+        # Pages rendered on each sampled site, by site ID.
+        self.pages = {}
+
+    def configure_site(self, site):
+        seo_set = SeoSettings.for_site(site)
+        seo_set.og_meta = True
+        seo_set.twitter_meta = True
+        seo_set.struct_meta = True
+        seo_set.twitter_site = "@coderedcorp"
+        seo_set.struct_org_type = schema.SCHEMA_ORG_CHOICES[1][0]
+        seo_set.struct_org_name = "Org {0}".format(site.pk)
+        seo_set.save()
+
+    def add_sites(self, count):
+        root = Page.get_first_root_node()
+        while len(self.sites) < count:
+            n = len(self.sites)
+            home = root.add_child(
+                instance=Page(
+                    title="Site {0}".format(n), slug="site-{0}".format(n)
+                )
+            )
+            site = Site.objects.create(
+                hostname="site{0}.example.com".format(n),
+                root_page=home,
+                site_name="Site {0}".format(n),
+            )
+            self.configure_site(site)
+            self.sites.append(site)
+
+    def add_pages(self, site):
+        home = site.root_page
+        pages = {}
+        for model in (SeoPage, ArticlePage):
+            page = model(
+                title="{0} on {1}".format(model.__name__, site.hostname),
+                slug=model.__name__.lower(),
+                owner=self.owner,
+                first_published_at=timezone.now(),
+                last_published_at=timezone.now(),
+                search_description="A description of the page for benchmarks.",
+                og_image=Image.objects.create(
+                    title="Benchmark", file=get_test_image_file()
+                ),
+            )
+            home.add_child(instance=page)
+            pages[model] = page
+        self.pages[site.pk] = pages
+
+    def get_sample(self, count):
+        step = max(1, count // SAMPLE_SITES)
+        sample = self.sites[:count][::step][:SAMPLE_SITES]
+        for site in sample:
+            if site.pk not in self.pages:
+                self.add_pages(site)
+        return sample
+
+    def render(self, renderer, model, sample, cold):
+        """
+        Renders the page of ``model`` on each site of ``sample``, as it would
+        be for a new request, and returns the time and queries each took.
+        """
+        renditions = get_image_model().get_rendition_model().objects
+        timings = []
+        queries = []
+        for _ in range(ROUNDS):
+            for site in sample:
+                page = self.pages[site.pk][model]
+                if cold:
+                    renditions.filter(image_id=page.og_image_id).delete()
+                page = model.objects.get(pk=page.pk)
+                request = self.factory.get("/", HTTP_HOST=site.hostname)
+                page.bind_seo_request(request)
+                context = {"page": page, "self": page, "request": request}
+                counter = QueryCounter()
+                with connection.execute_wrapper(counter):
+                    start = time.perf_counter()
+                    renderer(context)
+                    timings.append(time.perf_counter() - start)
+                queries.append(counter.count)
+        return timings, queries
+
+    def test_render_meta(self):
+        results = []
+        for count in SITE_COUNTS:
+            self.add_sites(count)
+            sample = self.get_sample(count)
+            for struct_data in (True, False):
+                SeoSettings.objects.update(struct_meta=struct_data)
+                for template, renderer in RENDERERS.items():
+                    for model in (SeoPage, ArticlePage):
+                        for cold in (True, False):
+                            timings, queries = self.render(
+                                renderer, model, sample, cold
+                            )
+                            result = {
+                                "template": template,
+                                "model": model.__name__,
+                                "sites": count,
+                                "struct_data": struct_data,
+                                "renditions": "cold" if cold else "warm",
+                            }
+                            result.update(summarize(timings, queries))
+                            results.append(result)
+
+        save_results("results", results)
+
+
+@skipUnless(OUTPUT, "Set WAGTAILSEO_BENCHMARK to run benchmarks.")
+class JsonBenchmark(SimpleTestCase):
+    # Number of times the data is serialized, per round.
+    serializations = 1000
+
+    def get_org_dict(self):
+        """
+        Returns Organization structured data with many hours and actions.
+        """
+        now = timezone.now()
+        return {
+            "@context": "http://schema.org",
+            "@type": "Restaurant",
+            "name": "Café Nuñez",
+            "url": "https://www.example.com/",
+            "dateModified": now,
+            "openingHoursSpecification": [
+                {
+                    "@type": "OpeningHoursSpecification",
+                    "dayOfWeek": ["Monday", "Tuesday", "Wednesday"],
+                    "opens": datetime.time(9, 0),
+                    "closes": datetime.time(17, 30),
+                    "validFrom": now.date(),
+                }
+                for _ in range(50)
+            ],
+            "potentialAction": [
+                {
+                    "@type": "OrderAction",
+                    "target": {
+                        "@type": "EntryPoint",
+                        "urlTemplate": "https://www.example.com/order/",
+                        "inLanguage": "en-US",
+                    },
+                    "result": {"@type": "Reservation", "name": "Table"},
+                }
+                for _ in range(50)
+            ],
+            "geo": {"latitude": 41.4993, "longitude": -81.6944},
+        }
+
+    def test_serialize_json(self):
+        data = self.get_org_dict()
+        results = []
+        backends = ["json"]
+        if utils.orjson is not None:
+            backends.append("orjson")
+        for backend in backends:
+            with self.settings(WAGTAILSEO_JSON_BACKEND=backend):
+                size = len(utils.dumps_struct_data(data).encode("utf8"))
+                timings = []
+                for _ in range(ROUNDS):
+                    start = time.perf_counter()
+                    for _ in range(self.serializations):
+                        utils.dumps_struct_data(data)
+                    timings.append(
+                        (time.perf_counter() - start) / self.serializations
+                    )
+            results.append(
+                {
+                    "backend": backend,
+                    "bytes": size,
+                    "median_us": statistics.median(timings) * 1000000,
+                    "min_us": min(timings) * 1000000,
+                }
+            )
+        save_results("json", results)
+
+
+@skipUnless(OUTPUT, "Set WAGTAILSEO_BENCHMARK to run benchmarks.")
+class ImportBenchmark(SimpleTestCase):
+    def get_import_time(self):
+        """
+        Returns the cumulative time, in microseconds, of importing
+        ``wagtailseo.models`` in a new interpreter, as reported by
+        ``python -X importtime``.
+        """
+        env = dict(os.environ, DJANGO_SETTINGS_MODULE="testproject.settings")
+        proc = subprocess.run(
+            [
+                sys.executable,
+                "-X",
+                "importtime",
+                "-c",
+                "import django; django.setup()",
+            ],
+            cwd=os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+            env=env,
+            capture_output=True,
+            text=True,
+            check=True,
+        )
+        # Each line is "import time: self | cumulative | <indented name>".
+        for line in proc.stderr.splitlines():
+            parts = line.split("|")
+            if len(parts) == 3 and parts[2].strip() == "wagtailseo.models":
+                return int(parts[1])
+        self.fail("wagtailseo.models was not imported.")
+
+    def test_import_models(self):
+        timings = [self.get_import_time() for _ in range(ROUNDS)]
+        save_results(
+            "import",
+            {
+                "module": "wagtailseo.models",
+                "median_us": statistics.median(timings),
+                "min_us": min(timings),
+            },
+        )
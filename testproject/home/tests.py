@@ -1,24 +1,140 @@
+import csv
+import functools
+import gzip
+import io
 import json
+import multiprocessing
+import os
+import subprocess
+import sys
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+from datetime import date
+from datetime import datetime
+from datetime import time
+from datetime import timezone as tz
 from decimal import Decimal
+from functools import cached_property
+from unittest import mock
+from unittest import skipIf
 
+from asgiref.sync import sync_to_async
 from django.contrib.auth.models import User
 from django.contrib.contenttypes.models import ContentType
+from django.core.cache import caches
+from django.core.exceptions import ImproperlyConfigured
+from django.core.exceptions import ValidationError
+from django.core.management import call_command
+from django.core.signals import request_finished
+from django.db import close_old_connections
+from django.db import connection
+from django.db import transaction
+from django.http import HttpResponse
+from django.template import Context
+from django.template import Template
+from django.template import engines
+from django.template.loader import render_to_string
+from django.test import RequestFactory
+from django.test import SimpleTestCase
 from django.test import TestCase
+from django.test import TransactionTestCase
 from django.test import override_settings
+from django.test.utils import CaptureQueriesContext
 from django.urls import reverse
 from django.utils import timezone
 from django.utils.text import capfirst
+from wagtail import VERSION as WAG_VERSION
+from wagtail.blocks.struct_block import StructBlockValidationError
 from wagtail.images.tests.utils import Image
 from wagtail.images.tests.utils import get_test_image_file
 from wagtail.models import Page
+from wagtail.models import Site
 from wagtail.test.utils import WagtailTestUtils
 
 from home.models import ArticlePage
 from home.models import SeoPage
 from home.models import WagtailPage
+from wagtailseo import audit
+from wagtailseo import cache
+from wagtailseo import renditions
 from wagtailseo import schema
+from wagtailseo import signal_handlers
+from wagtailseo import sitemaps
 from wagtailseo import utils
+from wagtailseo.blocks import StructuredDataActionBlock
+from wagtailseo.management.commands import seo_audit
+from wagtailseo.meta import render_seo_meta
+from wagtailseo.middleware import SeoRequestMiddleware
+from wagtailseo.models import SeoMixin
+from wagtailseo.models import SeoPageMeta
 from wagtailseo.models import SeoSettings
+from wagtailseo.models import prefetch_seo_renditions
+from wagtailseo.signals import seo_timing
+
+
+# Queries taken by each SEO property of an ArticlePage, and by rendering each
+# template, on a fresh instance during a request whose Site and SeoSettings are
+# already loaded, with every rendition already generated. Budgets are listed by
+# the first version of Wagtail they apply to, where they change.
+QUERY_BUDGETS = {
+    (4, 0): {
+        "seo_author": 1,
+        "seo_canonical_url": 0,
+        "seo_description": 0,
+        "seo_image": 1,
+        "seo_image_filters": 0,
+        "seo_image_url": 5,
+        "seo_logo": 0,
+        "seo_logo_url": 1,
+        "seo_meta": 6,
+        "seo_og_type": 0,
+        "seo_org_fields": 0,
+        "seo_pagetitle": 0,
+        "seo_published_at": 0,
+        "seo_settings": 0,
+        "seo_site": 0,
+        "seo_sitemap_image_urls": 5,
+        "seo_sitename": 0,
+        "seo_stored_meta": 0,
+        "seo_struct_article_dict": 9,
+        "seo_struct_article_json": 9,
+        "seo_struct_org_base_dict": 4,
+        "seo_struct_org_base_json": 4,
+        "seo_struct_org_dict": 4,
+        "seo_struct_org_json": 4,
+        "seo_struct_org_name": 0,
+        "seo_struct_publisher_dict": 4,
+        "seo_twitter_card_content": 0,
+        "wagtailseo/meta.html": 6,
+        "wagtailseo/struct_data.html": 9,
+        "wagtailseo/struct_org_data.html": 4,
+    },
+    # Existing renditions of an image are found with a single query.
+    (5, 1): {
+        "seo_image_url": 1,
+        "seo_logo_url": 0,
+        "seo_meta": 2,
+        "seo_sitemap_image_urls": 1,
+        "seo_struct_article_dict": 2,
+        "seo_struct_article_json": 2,
+        "seo_struct_org_base_dict": 0,
+        "seo_struct_org_base_json": 0,
+        "seo_struct_org_dict": 0,
+        "seo_struct_org_json": 0,
+        "seo_struct_publisher_dict": 0,
+        "wagtailseo/meta.html": 2,
+        "wagtailseo/struct_data.html": 2,
+        "wagtailseo/struct_org_data.html": 0,
+    },
+}
+
+
+def get_query_budget(name: str) -> int:
+    budget = {}
+    for version, budgets in sorted(QUERY_BUDGETS.items()):
+        if WAG_VERSION >= version:
+            budget.update(budgets)
+    return budget[name]
 
 
 class SeoTest(TestCase):
@@ -128,8 +244,10 @@ class SeoTest(TestCase):
     @classmethod
     def tearDownClass(cls):
         # Delete pages.
+        cls.page_wagtail.delete()
         cls.page_lowseo.delete()
         cls.page_fullseo.delete()
+        cls.page_article.delete()
         # Delete user.
         cls.user.delete()
 
@@ -269,7 +387,12 @@ class SeoTest(TestCase):
             expected_dict["potentialAction"].append(action.value.struct_dict)
         expected_dict.update(json.loads(self.seo_set.struct_org_extra_json))
 
-        expected_json = json.dumps(expected_dict, cls=utils.StructDataEncoder)
+        expected_json = json.dumps(
+            expected_dict,
+            cls=utils.StructDataEncoder,
+            ensure_ascii=False,
+            separators=(",", ":"),
+        )
 
         # GET the page and check its JSON against expected JSON.
         response = self.client.get(page.get_url())
@@ -285,6 +408,52 @@ class SeoTest(TestCase):
             response.content.decode("utf8"),
         )
 
+    def test_struct_extra_json(self):
+        """
+        Additional JSON-LD should be validated when saved, parsed only once,
+        and ignored rather than breaking the page if invalid.
+        """
+        seo_set = SeoSettings.objects.get(pk=self.seo_set.pk)
+        seo_set.struct_org_extra_json = "{'json': true}"
+        with self.assertRaises(ValidationError) as cm:
+            seo_set.full_clean()
+        self.assertIn("struct_org_extra_json", cm.exception.message_dict)
+        seo_set.struct_org_extra_json = '{"json": true}'
+        seo_set.full_clean()
+
+        block = StructuredDataActionBlock()
+        action = self.seo_set.struct_org_actions[0].value
+        for extra_json in ["[1, 2]", "{", '"text"']:
+            value = block.to_python(dict(action, extra_json=extra_json))
+            with self.assertRaises(StructBlockValidationError):
+                block.clean(value)
+        value = block.to_python(
+            dict(action, extra_json='{"price": "$$", "offers": {"a": 1}}')
+        )
+        self.assertEqual(block.clean(value).struct_dict["price"], "$$")
+        # Parsed objects are shared, so callers get their own copy.
+        value.struct_dict["offers"]["a"] = 2
+        self.assertEqual(value.struct_dict["offers"], {"a": 1})
+        seo_set.struct_org_extra_dict["json"] = False
+        self.assertTrue(seo_set.struct_org_extra_dict["json"])
+
+        utils.parse_json_object.cache_clear()
+        with mock.patch.object(utils, "loads", wraps=json.loads) as loads:
+            for _ in range(2):
+                page = SeoPage.objects.get(pk=self.page_fullseo.pk)
+                self.assertTrue(page.seo_struct_org_dict["json"])
+        loads.assert_called_once()
+
+        # Invalid JSON saved before it was validated is left out.
+        SeoSettings.objects.filter(pk=self.seo_set.pk).update(
+            struct_org_extra_json="{"
+        )
+        cache.bump_settings_version(self.seo_set.site_id)
+        with self.assertLogs("wagtailseo", "WARNING"):
+            response = self.client.get(self.page_fullseo.get_url())
+        self.assertContains(response, "application/ld+json")
+        self.assertNotContains(response, "thing1")
+
     def test_struct_article(self):
         """
         A page with SeoMixin set to article type should render correct
@@ -316,7 +485,12 @@ class SeoTest(TestCase):
             "image": [img1x1, img4x3, img16x9],
             "publisher": page.seo_struct_publisher_dict,
         }
-        expected_json = json.dumps(expected_dict, cls=utils.StructDataEncoder)
+        expected_json = json.dumps(
+            expected_dict,
+            cls=utils.StructDataEncoder,
+            ensure_ascii=False,
+            separators=(",", ":"),
+        )
 
         # GET the page and check its JSON against expected JSON.
         response = self.client.get(page.get_url())
@@ -332,6 +506,43 @@ class SeoTest(TestCase):
             response.content.decode("utf8"),
         )
 
+    def test_json_backend(self):
+        """
+        Structured data should serialize the same with either JSON backend.
+        """
+        data = {
+            "name": "Café “Nuñez” </script>",
+            "date": date(2024, 2, 29),
+            "datetime": datetime(2024, 2, 29, 9, 30, 15, 123, tzinfo=tz.utc),
+            "naive": datetime(2024, 2, 29, 9, 30),
+            "time": time(17, 0),
+            "geo": [1.1, -2.25, 0],
+            "nested": [{"ok": True, "none": None}],
+        }
+        expected = json.dumps(
+            data,
+            cls=utils.StructDataEncoder,
+            ensure_ascii=False,
+            separators=(",", ":"),
+        )
+        for backend in ["json", "orjson"]:
+            if backend == "orjson" and utils.orjson is None:
+                continue
+            with (
+                self.subTest(backend),
+                self.settings(WAGTAILSEO_JSON_BACKEND=backend),
+            ):
+                self.assertEqual(utils.dumps_struct_data(data), expected)
+
+        with mock.patch.object(utils, "orjson", None):
+            self.assertEqual(utils.get_json_backend(), "json")
+            with self.settings(WAGTAILSEO_JSON_BACKEND="orjson"):
+                with self.assertRaises(ImproperlyConfigured):
+                    utils.get_json_backend()
+        with self.settings(WAGTAILSEO_JSON_BACKEND="ujson"):
+            with self.assertRaises(ImproperlyConfigured):
+                utils.dumps_struct_data(data)
+
     @override_settings(WAGTAILSEO_SEP="|")
     def test_custom_sep(self):
         page = self.page_lowseo
@@ -342,13 +553,970 @@ class SeoTest(TestCase):
             response.content.decode("utf8"),
         )
 
+    @override_settings(WAGTAILSEO_CACHE="default")
+    def test_meta_cache(self):
+        """
+        The rendered metadata should be cached until the page is published or
+        the settings are saved.
+        """
+        caches["default"].clear()
+        page = SeoPage.objects.get(pk=self.page_lowseo.pk)
+        response = self.client.get(page.get_url())
+        self.assertContains(response, "og:title")
+
+        # Changes without a new revision are not rendered.
+        SeoPage.objects.filter(pk=page.pk).update(seo_title="Changed Title")
+        response = self.client.get(page.get_url())
+        self.assertNotContains(response, "Changed Title")
+
+        # Saving the settings invalidates the cache.
+        self.seo_set.save()
+        response = self.client.get(page.get_url())
+        self.assertContains(response, "<title>Changed Title</title>")
+
+        # As does publishing the page.
+        page.refresh_from_db()
+        page.seo_title = "Published Title"
+        page.save_revision().publish()
+        response = self.client.get(page.get_url())
+        self.assertContains(response, "<title>Published Title</title>")
+
+    @override_settings(WAGTAILSEO_CACHE="default")
+    def test_meta_cache_image_changed(self):
+        """
+        Replacing the file of an image should invalidate the cached metadata
+        of pages using it, whose rendition URLs change.
+        """
+        caches["default"].clear()
+        page = ArticlePage.objects.get(pk=self.page_article.pk)
+        page.og_image = Image.objects.create(
+            title="Cached Image",
+            file=get_test_image_file(),
+        )
+        page.save_revision().publish()
+        old_url = page.seo_image_url
+        response = self.client.get(page.get_url())
+        self.assertContains(response, old_url)
+
+        # As done by the image edit view of the Wagtail admin.
+        page.og_image.file = get_test_image_file(filename="replaced.png")
+        page.og_image.save()
+        page.og_image.renditions.all().delete()
+        page = ArticlePage.objects.get(pk=page.pk)
+        response = self.client.get(page.get_url())
+        self.assertNotContains(response, old_url)
+        self.assertContains(response, page.seo_image_url)
+
+    @override_settings(
+        WAGTAILSEO_CACHE="default", WAGTAILSEO_RENDITION_WORKERS=1
+    )
+    def test_meta_cache_background_renditions(self):
+        """
+        Output rendered with the original image in place of renditions still
+        being generated should be invalidated once they exist.
+        """
+        caches["default"].clear()
+        page = ArticlePage.objects.get(pk=self.page_article.pk)
+        page.og_image = Image.objects.create(
+            title="Pending Image",
+            file=get_test_image_file(),
+        )
+        page.save_revision().publish()
+        seo_set = SeoSettings.objects.get(pk=self.seo_set.pk)
+        seo_set.struct_org_logo = Image.objects.create(
+            title="Pending Logo",
+            file=get_test_image_file(),
+        )
+        seo_set.save()
+        response = self.client.get(page.get_url())
+        self.assertContains(response, page.og_image.file.url)
+        self.assertContains(response, seo_set.struct_org_logo.file.url)
+
+        for image in (page.og_image, seo_set.struct_org_logo):
+            renditions.generate_renditions(image, utils.SEO_RENDITION_FILTERS)
+        response = self.client.get(page.get_url())
+        self.assertNotContains(response, page.og_image.file.url)
+        self.assertNotContains(response, seo_set.struct_org_logo.file.url)
+
+    @override_settings(WAGTAILSEO_CACHE="default")
+    def test_meta_cache_extends(self):
+        """
+        Templates extending meta.html should be cached separately from it,
+        and for each request path.
+        """
+        cache.bump_settings_version(self.seo_set.site_id)
+
+        def render(template, path, **context):
+            request = RequestFactory().get(path)
+            page = SeoPage.objects.get(pk=self.page_lowseo.pk)
+            context.update({"page": page, "self": page})
+            return render_to_string(template, context, request)
+
+        html = render("home/meta_route.html", "/one/", route="one")
+        self.assertInHTML("<title>Route one</title>", html)
+        html = render("home/meta_route.html", "/two/", route="two")
+        self.assertInHTML("<title>Route two</title>", html)
+        html = render("wagtailseo/meta.html", "/one/")
+        self.assertNotIn("Route", html)
+        self.assertIn("<title>Low Seo Page", html)
+
+    @override_settings(WAGTAILSEO_CACHE="default")
+    def test_struct_org_cache(self):
+        """
+        Organization data should be built once per site, and shared between
+        pages with only the URL changed.
+        """
+        caches["default"].clear()
+        page_low = SeoPage.objects.get(pk=self.page_lowseo.pk)
+        page_full = SeoPage.objects.get(pk=self.page_fullseo.pk)
+        with mock.patch(
+            "wagtailseo.utils.get_struct_data_images",
+            wraps=utils.get_struct_data_images,
+        ) as get_images:
+            low_dict = page_low.seo_struct_org_dict
+            full_dict = page_full.seo_struct_org_dict
+        self.assertEqual(get_images.call_count, 1)
+        self.assertEqual(low_dict["url"], page_low.seo_canonical_url)
+        self.assertEqual(full_dict["url"], page_full.seo_canonical_url)
+        del low_dict["url"], full_dict["url"]
+        self.assertEqual(low_dict, full_dict)
+
+    def test_query_budgets(self):
+        """
+        Each SEO property and template should take exactly the number of
+        queries in its budget. When a change adds or saves queries, update
+        ``QUERY_BUDGETS`` for the affected versions of Wagtail.
+        """
+        names = [
+            name
+            for name in dir(SeoMixin)
+            if name.startswith("seo_")
+            and isinstance(getattr(SeoMixin, name), (property, cached_property))
+            and name != "seo_request"
+        ]
+        templates = [
+            "wagtailseo/meta.html",
+            "wagtailseo/struct_data.html",
+            "wagtailseo/struct_org_data.html",
+        ]
+
+        def get_page():
+            request = RequestFactory().get("/")
+            Site.find_for_request(request)
+            SeoSettings.for_request(request)
+            page = ArticlePage.objects.get(pk=self.page_article.pk)
+            page.bind_seo_request(request)
+            return page, request
+
+        # Generate every rendition first.
+        page, request = get_page()
+        for name in names:
+            getattr(page, name)
+        for template in templates:
+            render_to_string(template, {"page": page, "self": page}, request)
+
+        for name in names + templates:
+            page, request = get_page()
+            with CaptureQueriesContext(connection) as queries:
+                if name in templates:
+                    render_to_string(
+                        name, {"page": page, "self": page}, request
+                    )
+                else:
+                    getattr(page, name)
+            with self.subTest(name):
+                self.assertEqual(
+                    len(queries),
+                    get_query_budget(name),
+                    "\n".join(q["sql"] for q in queries.captured_queries),
+                )
+
+    def test_timing(self):
+        """
+        When enabled, SEO computations should be timed, reported in the
+        Server-Timing header, and sent to the seo_timing signal.
+        """
+        page = ArticlePage.objects.get(pk=self.page_article.pk)
+        response = self.client.get(page.get_url())
+        self.assertFalse(response.has_header("Server-Timing"))
+
+        received = []
+
+        def receiver(sender, name, duration, queries, request, **kwargs):
+            received.append(name)
+            self.assertGreaterEqual(duration, 0)
+            self.assertIsNotNone(request)
+
+        seo_timing.connect(receiver)
+        self.addCleanup(seo_timing.disconnect, receiver)
+        with override_settings(WAGTAILSEO_TIMING=True):
+            response = self.client.get(page.get_url())
+        header = response["Server-Timing"]
+        for name in (
+            "meta.html",
+            "get_seo_meta",
+            "seo_image_url",
+            "seo_struct_article_dict",
+            "seo_struct_org_dict",
+        ):
+            self.assertIn(name, received)
+            self.assertIn(name + ";dur=", header)
+        self.assertRegex(header, r'get_seo_meta;dur=[\d.]+;desc="1 calls')
+
+    def test_prefetch_seo_renditions(self):
+        """
+        Once prefetched, SEO properties of many pages should not need any
+        further queries.
+        """
+        pks = [self.page_lowseo.pk, self.page_fullseo.pk, self.page_article.pk]
+        # Forget renditions cached by other tests.
+        caches["default"].clear()
+
+        # Make sure all renditions exist.
+        expected = {}
+        for page in Page.objects.filter(pk__in=pks).specific():
+            expected[page.pk] = (
+                page.seo_image_url,
+                page.seo_logo_url,
+                page.seo_struct_org_json,
+                page.seo_struct_article_json,
+            )
+
+        pages = list(Page.objects.filter(pk__in=pks).specific())
+        with self.assertNumQueries(5):
+            prefetch_seo_renditions(pages)
+        with self.assertNumQueries(0):
+            for page in pages:
+                self.assertEqual(
+                    expected[page.pk],
+                    (
+                        page.seo_image_url,
+                        page.seo_logo_url,
+                        page.seo_struct_org_json,
+                        page.seo_struct_article_json,
+                    ),
+                )
+
+    @override_settings(WAGTAILSEO_RENDITION_WORKERS=1)
+    def test_background_renditions(self):
+        """
+        Missing renditions should be scheduled instead of generated during the
+        request, rendering the original image in the meantime.
+        """
+        image = Image.objects.create(
+            title="Background Image",
+            file=get_test_image_file(),
+        )
+        spec = utils.STRUCT_DATA_FILTERS[0]
+        with self.captureOnCommitCallbacks() as callbacks:
+            url = renditions.get_rendition_url(image, spec)
+        self.assertEqual(url, image.file.url)
+        self.assertEqual(len(callbacks), 1)
+        self.assertFalse(image.renditions.filter(filter_spec=spec).exists())
+
+        renditions.generate_renditions(image, [spec])
+        self.assertEqual(
+            renditions.get_rendition_url(image, spec),
+            image.get_rendition(spec).url,
+        )
+
+        # Publishing schedules renditions of the page's images.
+        page = ArticlePage.objects.get(pk=self.page_article.pk)
+        with mock.patch(
+            "wagtailseo.renditions.pregenerate_renditions"
+        ) as pregenerate:
+            page.save_revision().publish()
+        images = [c.args[0] for c in pregenerate.call_args_list]
+        self.assertIn(page.og_image, images)
+        self.assertIn(self.seo_set.struct_org_image, images)
+
+    def test_batched_renditions(self):
+        """
+        All SEO renditions of an image should be generated from a single read
+        of the original, and only looked up once per image instance.
+        """
+        image = Image.objects.create(
+            title="Batched Image",
+            file=get_test_image_file(),
+        )
+        with mock.patch.object(
+            Image, "open_file", autospec=True, side_effect=Image.open_file
+        ) as open_file:
+            result = renditions.get_renditions(
+                image, utils.SEO_RENDITION_FILTERS
+            )
+        self.assertEqual(list(result), list(utils.SEO_RENDITION_FILTERS))
+        if hasattr(image, "get_renditions"):
+            self.assertEqual(open_file.call_count, 1)
+        site = self.page_home.get_site()
+        with self.assertNumQueries(0):
+            utils.get_struct_data_images(site, image)
+
+    def test_request_resolution(self):
+        """
+        Given a request, the site and settings should be shared with the rest
+        of the request instead of being looked up again.
+        """
+        request = RequestFactory().get("/")
+        site = Site.find_for_request(request)
+        seo_settings = SeoSettings.for_request(request)
+        page = SeoPage.objects.get(pk=self.page_fullseo.pk)
+        with CaptureQueriesContext(connection) as queries:
+            seo = page.get_seo_meta(request)
+        for query in queries.captured_queries:
+            self.assertNotIn("wagtailcore_site", query["sql"])
+            self.assertNotIn("wagtailseo_seosettings", query["sql"])
+        self.assertIs(page.seo_site, site)
+        self.assertIs(page.seo_settings, seo_settings)
+        self.assertEqual(seo.canonical_url, page.get_full_url(request))
+
+        # The middleware binds the request while it is being served.
+        def get_response(r):
+            self.assertIs(utils.get_current_request(), r)
+            return HttpResponse()
+
+        SeoRequestMiddleware(get_response)(request)
+        self.assertIsNone(utils.get_current_request())
+
+    @override_settings(WAGTAILSEO_CACHE="default")
+    def test_settings_cache(self):
+        """
+        Settings should be kept in the process, along with their images, until
+        they are saved.
+        """
+        site = Site.objects.get(is_default_site=True)
+        cache.bump_settings_version(site.pk)
+        seo_settings = SeoSettings.for_site(site)
+
+        # Later requests only check the settings version, once per request.
+        request = RequestFactory().get("/")
+        Site.find_for_request(request)
+        with self.assertNumQueries(0):
+            for obj in [
+                SeoSettings.for_site(site, request),
+                SeoSettings.for_request(request),
+            ]:
+                # Each caller gets a copy, sharing the same images.
+                self.assertIsNot(obj, seo_settings)
+                self.assertEqual(obj.pk, seo_settings.pk)
+                self.assertIs(obj.struct_org_logo, seo_settings.struct_org_logo)
+                obj.og_image_default
+                obj.struct_org_image
+
+        # Saving the settings invalidates them in every process.
+        self.seo_set.save()
+        self.assertIsNot(
+            SeoSettings.for_site(site).struct_org_logo,
+            seo_settings.struct_org_logo,
+        )
+
     def test_preview(self):
         """
         Tests the wagtail page preview, in SEO mode.
         """
-        page = self.page_fullseo
+        # Older versions of Wagtail preview the instance itself, so use a
+        # fresh one to leave no cached values behind.
+        page = SeoPage.objects.get(pk=self.page_fullseo.pk)
         response = page.make_preview_request(preview_mode="wagtail-seo")
         self.assertEqual(response.status_code, 200)
+        self.assertEqual(
+            response.context_data["seo_head"]["title"], "Custom Title"
+        )
+        self.assertEqual(
+            response.context_data["seo_head"]["og_description"],
+            "Custom Description",
+        )
+
+    @override_settings(WAGTAILSEO_CACHE="default")
+    def test_preview_cache(self):
+        """
+        Previews of an unchanged draft should be served from the cache.
+        """
+        page = SeoPage.objects.get(pk=self.page_fullseo.pk)
+        with mock.patch.object(
+            SeoPage,
+            "get_seo_preview_context",
+            autospec=True,
+            side_effect=SeoPage.get_seo_preview_context,
+        ) as get_context:
+            page.make_preview_request(preview_mode="wagtail-seo")
+            response = page.make_preview_request(preview_mode="wagtail-seo")
+            self.assertEqual(get_context.call_count, 1)
+            self.assertEqual(
+                response.context_data["seo_head"]["title"], "Custom Title"
+            )
+
+            # Any change to the draft is previewed again.
+            page = SeoPage.objects.get(pk=self.page_fullseo.pk)
+            page.seo_title = "Draft Title"
+            response = page.make_preview_request(preview_mode="wagtail-seo")
+            self.assertEqual(get_context.call_count, 2)
+            self.assertEqual(
+                response.context_data["seo_head"]["title"], "Draft Title"
+            )
+
+    def test_seo_audit(self):
+        """
+        The audit should report every failed check of every live SEO page.
+        """
+        SeoSettings.objects.filter(pk=self.seo_set.pk).update(
+            struct_org_extra_json="[]"
+        )
+        out = io.StringIO()
+        call_command(
+            "seo_audit",
+            workers=0,
+            batch_size=2,
+            stdout=out,
+            stderr=io.StringIO(),
+        )
+        rows = [json.loads(line) for line in out.getvalue().splitlines()]
+        rules = {(row["page_id"], row["rule"]) for row in rows}
+        self.assertIn((self.page_lowseo.pk, "description"), rules)
+        self.assertIn((self.page_lowseo.pk, "struct_org_extra_json"), rules)
+        self.assertIn((self.page_lowseo.pk, "image"), rules)
+        self.assertNotIn((self.page_fullseo.pk, "image"), rules)
+        self.assertNotIn(self.page_wagtail.pk, {row["page_id"] for row in rows})
+
+        out = io.StringIO()
+        call_command(
+            "seo_audit",
+            workers=0,
+            format="csv",
+            stdout=out,
+            stderr=io.StringIO(),
+        )
+        csv_rows = list(csv.DictReader(io.StringIO(out.getvalue())))
+        self.assertEqual(
+            [(int(r["page_id"]), r["rule"]) for r in csv_rows],
+            [(r["page_id"], r["rule"]) for r in rows],
+        )
+
+    @skipIf(WAG_VERSION < (6, 1), "The SEO report requires Wagtail 6.1+")
+    def test_seo_report(self):
+        """
+        The SEO report should list pages failing the checks, as computed by
+        the database.
+        """
+        self.client.force_login(self.user)
+        url = reverse("wagtailseo_report")
+        response = self.client.get(url, {"ordering": "-seo_title_length"})
+        self.assertEqual(response.status_code, 200)
+        pages = list(response.context["object_list"])
+        self.assertIn(self.page_lowseo.pk, [p.pk for p in pages])
+        self.assertNotIn(self.page_wagtail.pk, [p.pk for p in pages])
+        low = next(p for p in pages if p.pk == self.page_lowseo.pk)
+        self.assertEqual(low.seo_title_length, len(self.page_lowseo.title))
+        self.assertEqual(low.seo_description_length, 0)
+        self.assertTrue(low.seo_missing_image)
+
+        response = self.client.get(
+            reverse("wagtailseo_report_results"), {"rule": "image"}
+        )
+        pks = [p.pk for p in response.context["object_list"]]
+        self.assertIn(self.page_lowseo.pk, pks)
+        self.assertNotIn(self.page_fullseo.pk, pks)
+
+        response = self.client.get(url, {"export": "csv"})
+        self.assertContains(response, "Title length")
+
+    def test_audit_title(self):
+        """
+        The title check should measure the same title in Python and in the
+        database: the SEO title, or the title if blank.
+        """
+        page = SeoPage.objects.get(pk=self.page_lowseo.pk)
+        page.title = "x" * (audit.TITLE_MAX_LENGTH + 1)
+        page.seo_title = ""
+        page.save()
+        self.assertIsNotNone(audit.check_title(page))
+        failing = audit.annotate_warnings(SeoPage.objects.all()).filter(
+            audit.get_warning_q("title")
+        )
+        self.assertIn(page, failing)
+
+        page.seo_title = "Short"
+        page.save()
+        self.assertIsNone(audit.check_title(page))
+        self.assertNotIn(page, failing.all())
+
+    def test_head_tags(self):
+        """
+        Only the head of the document should be scanned, regardless of how the
+        content is split.
+        """
+        response = HttpResponse(
+            "<!doctype html><html><head><title> Tom &amp; Jerry </title>"
+            '<link rel="shortcut icon" href="/favicon.ico">'
+            '<link rel="canonical" href="https://example.com/">'
+            '<meta name="description" content="Head">'
+            '<meta property="og:title" content="Café">'
+            "</head><body><title>Body</title>"
+            '<meta name="description" content="Body">'
+            "</body></html>"
+        )
+        tags = utils.get_head_tags(response, chunk_size=7)
+        self.assertEqual(
+            tags,
+            {
+                "title": "Tom & Jerry",
+                "icon": "/favicon.ico",
+                "canonical": "https://example.com/",
+                "description": "Head",
+                "og_title": "Café",
+            },
+        )
+
+    def test_seo_meta(self):
+        """
+        The SeoMeta snapshot should match the individual properties, and
+        should be computed only once per page instance.
+        """
+        page = ArticlePage.objects.get(pk=self.page_article.pk)
+        seo = page.seo_meta
+        self.assertEqual(seo.pagetitle, page.seo_pagetitle)
+        self.assertEqual(seo.canonical_url, page.seo_canonical_url)
+        self.assertEqual(seo.description, page.seo_description)
+        self.assertEqual(seo.author, page.seo_author)
+        self.assertEqual(seo.image_url, page.seo_image_url)
+        self.assertEqual(seo.sitename, page.seo_sitename)
+        self.assertEqual(seo.twitter_site, self.seo_set.at_twitter_site)
+        self.assertTrue(seo.og_meta)
+        with self.assertNumQueries(0):
+            self.assertIs(page.seo_meta, seo)
+        with self.assertRaises(AttributeError):
+            seo.pagetitle = "Changed"
+
+        # The image, and its renditions, are not resolved unless rendered.
+        SeoSettings.objects.filter(pk=self.seo_set.pk).update(
+            og_meta=False, twitter_meta=False
+        )
+        page = ArticlePage.objects.get(pk=self.page_article.pk)
+        with mock.patch.object(
+            ArticlePage, "seo_image_url", new_callable=mock.PropertyMock
+        ) as image_url:
+            self.assertEqual(page.get_seo_meta().image_url, "")
+        image_url.assert_not_called()
+
+    def test_seo_meta_tag(self):
+        """
+        The seo_meta template tag should render the same metadata as
+        meta.html, including subclass overrides of its hooks.
+        """
+        tag = Template("{% load wagtailseo_tags %}{% seo_meta %}")
+        for page in [self.page_lowseo, self.page_fullseo, self.page_article]:
+            request = RequestFactory().get("/")
+            page = page.specific_class.objects.get(pk=page.pk)
+            page.search_description = 'Fish & "chips" <b>'
+            context = {"page": page, "self": page, "request": request}
+            with self.subTest(page.slug):
+                self.assertHTMLEqual(
+                    tag.render(Context(context)),
+                    render_to_string("wagtailseo/meta.html", context),
+                )
+        self.assertEqual(tag.render(Context({"self": self.page_home})), "")
+
+        page = ArticlePage.objects.get(pk=self.page_article.pk)
+        with mock.patch.object(
+            ArticlePage,
+            "get_seo_twitter_tags",
+            lambda self, seo: ['<meta name="twitter:creator" content="@a" />'],
+        ):
+            html = str(render_seo_meta(page, RequestFactory().get("/")))
+        self.assertIn('<meta name="twitter:creator" content="@a" />', html)
+        self.assertNotIn("twitter:site", html)
+        self.assertIn("og:title", html)
+
+    def test_jinja2(self):
+        """
+        The Jinja2 extension should render the same metadata and structured
+        data as the Django templates.
+        """
+        templates = {
+            "seo_meta": "wagtailseo/meta.html",
+            "seo_struct_data": "wagtailseo/struct_data.html",
+            "seo_struct_org_data": "wagtailseo/struct_org_data.html",
+        }
+        for page in [self.page_lowseo, self.page_fullseo, self.page_article]:
+            for func, template in templates.items():
+                request = RequestFactory().get("/")
+                page = page.specific_class.objects.get(pk=page.pk)
+                context = {"page": page, "self": page}
+                html = render_to_string(template, context, request)
+                jinja = engines["jinja2"].from_string(
+                    "{{{{ {0}() }}}}".format(func)
+                )
+                with self.subTest(page.slug, template=template):
+                    if func == "seo_meta":
+                        self.assertHTMLEqual(
+                            jinja.render(context, request), html
+                        )
+                    else:
+                        self.assertEqual(
+                            jinja.render(context, request), html.strip()
+                        )
+
+    async def test_aget_seo_meta(self):
+        """
+        The async SeoMeta snapshot should match the sync one, with the
+        owner, images and renditions loaded up front.
+        """
+        for pk in [self.page_lowseo.pk, self.page_article.pk]:
+            request = RequestFactory().get("/")
+            page = await Page.objects.aget(pk=pk)
+            page = await sync_to_async(lambda page: page.specific)(page)
+            seo = await page.aget_seo_meta(request)
+            expected = await sync_to_async(
+                lambda page, pk, request: (
+                    type(page).objects.get(pk=pk).get_seo_meta(request)
+                )
+            )(page, pk, request)
+            with self.subTest(page.slug):
+                for name in seo.__slots__:
+                    self.assertEqual(
+                        getattr(seo, name), getattr(expected, name), name
+                    )
+
+        self.assertTrue(page._meta.get_field("owner").is_cached(page))
+        self.assertIn(
+            "original", page.og_image.__dict__["_wagtailseo_renditions"]
+        )
+
+    @override_settings(WAGTAILSEO_STORE_META=True)
+    def test_stored_meta(self):
+        """
+        Publishing a page should store its SEO values, which are then rendered
+        from the stored row until the page is unpublished.
+        """
+        page = ArticlePage.objects.get(pk=self.page_article.pk)
+        page.save_revision().publish()
+        stored = SeoPageMeta.objects.get(page_id=page.pk)
+        with override_settings(WAGTAILSEO_STORE_META=False):
+            live = ArticlePage.objects.get(pk=page.pk)
+            self.assertEqual(stored.pagetitle, live.seo_pagetitle)
+            self.assertEqual(stored.image_url, live.seo_image_url)
+            self.assertEqual(
+                stored.struct_article_json, live.seo_struct_article_json
+            )
+            self.assertEqual(stored.struct_org_json, live.seo_struct_org_json)
+
+        # The stored row is what gets rendered.
+        SeoPageMeta.objects.filter(page_id=page.pk).update(
+            pagetitle="Stored Title"
+        )
+        response = self.client.get(page.get_url())
+        self.assertContains(response, "<title>Stored Title</title>")
+
+        # Saving settings invalidates stored rows of the site.
+        self.seo_set.save()
+        self.assertFalse(SeoPageMeta.objects.filter(page_id=page.pk).exists())
+
+        page.save_revision().publish()
+        self.assertTrue(SeoPageMeta.objects.filter(page_id=page.pk).exists())
+        page.unpublish()
+        self.assertFalse(SeoPageMeta.objects.filter(page_id=page.pk).exists())
+
+    @override_settings(WAGTAILSEO_STORE_META=True)
+    def test_stored_meta_image_changed(self):
+        """
+        Changing or deleting an image should delete the stored SEO values of
+        pages using it, directly or through the settings of their site.
+        """
+        page = ArticlePage.objects.get(pk=self.page_article.pk)
+        page.og_image = Image.objects.create(
+            title="Stored Image",
+            file=get_test_image_file(),
+        )
+        page.save_revision().publish()
+        self.assertTrue(SeoPageMeta.objects.filter(page_id=page.pk).exists())
+        page.og_image.file = get_test_image_file(filename="replaced.png")
+        page.og_image.save()
+        self.assertFalse(SeoPageMeta.objects.filter(page_id=page.pk).exists())
+
+        page.save_revision().publish()
+        self.seo_set.struct_org_logo.save()
+        self.assertFalse(SeoPageMeta.objects.filter(page_id=page.pk).exists())
+
+        page.save_revision().publish()
+        page.og_image.delete()
+        self.assertFalse(SeoPageMeta.objects.filter(page_id=page.pk).exists())
+
+    @override_settings(
+        WAGTAILSEO_STORE_META=True, WAGTAILSEO_RENDITION_WORKERS=1
+    )
+    def test_stored_meta_background_renditions(self):
+        """
+        With background renditions, SEO values should be stored once the
+        renditions exist, never with the original image in their place.
+        """
+        page = ArticlePage.objects.get(pk=self.page_article.pk)
+        page.og_image = Image.objects.create(
+            title="Stored Background Image",
+            file=get_test_image_file(),
+        )
+        with mock.patch("wagtailseo.renditions.run_in_background") as run:
+            page.save_revision().publish()
+        self.assertFalse(SeoPageMeta.objects.filter(page_id=page.pk).exists())
+
+        func, *args = run.call_args.args
+        func(*args)
+        stored = SeoPageMeta.objects.get(page_id=page.pk)
+        for spec in utils.STRUCT_DATA_FILTERS:
+            self.assertIn(
+                page.og_image.get_rendition(spec).url,
+                stored.struct_article_json,
+            )
+        self.assertNotIn(page.og_image.file.url, stored.struct_article_json)
+
+    @override_settings(WAGTAILSEO_SITEMAP_SHARD_SIZE=2)
+    def test_sitemap(self):
+        """
+        The sitemap should list canonical URLs of live pages, split into
+        shards listed in an index.
+        """
+        pages = sitemaps.get_sitemap_pages(
+            Site.objects.get(is_default_site=True)
+        )
+        num_shards = (pages.count() + 1) // 2
+        self.assertGreater(num_shards, 1)
+
+        response = self.client.get(reverse("wagtailseo_sitemap"))
+        self.assertEqual(response.status_code, 200)
+        index = response.content.decode("utf8")
+        self.assertEqual(index.count("<sitemap>"), num_shards)
+        self.assertIn("<loc>http://testserver", index)
+
+        urls = ""
+        for shard in range(num_shards):
+            response = self.client.get(
+                reverse("wagtailseo_sitemap_shard", args=[shard])
+            )
+            self.assertTrue(response.streaming)
+            self.assertFalse(response.has_header("Last-Modified"))
+            urls += b"".join(response.streaming_content).decode("utf8")
+        self.assertEqual(urls.count("<url>"), pages.count())
+        self.assertIn(
+            "<loc>{0}</loc><lastmod>".format(self.page_article.get_full_url()),
+            urls,
+        )
+        self.assertNotIn(self.page_wagtail.get_full_url(), urls)
+
+        # Images of each page, except the default image of the site.
+        article = ArticlePage.objects.get(pk=self.page_article.pk)
+        self.assertEqual(len(article.seo_sitemap_image_urls), 4)
+        for image_url in article.seo_sitemap_image_urls:
+            self.assertIn("<image:loc>{0}</image:loc>".format(image_url), urls)
+        self.assertEqual(urls.count("<image:image>"), 5)
+
+        # Out of range.
+        response = self.client.get(
+            reverse("wagtailseo_sitemap_shard", args=[num_shards])
+        )
+        self.assertEqual(response.status_code, 404)
+
+    @override_settings(WAGTAILSEO_SITEMAP_SHARD_SIZE=2)
+    def test_sitemap_canonical(self):
+        """
+        Pages whose canonical URL points elsewhere should be skipped.
+        """
+        page = SeoPage.objects.get(pk=self.page_fullseo.pk)
+        self.assertIn("<loc>", sitemaps.get_url_xml(page))
+        page.canonical_url = "https://example.com/elsewhere/"
+        self.assertEqual(sitemaps.get_url_xml(page), "")
+
+    def test_sitemap_queries(self):
+        """
+        Generating a shard should take the same number of queries, however
+        many pages of the same types and images it lists.
+        """
+        pages = sitemaps.get_sitemap_pages(
+            Site.objects.get(is_default_site=True)
+        )
+        b"".join(sitemaps.iter_shard_xml(pages))
+        with CaptureQueriesContext(connection) as one:
+            b"".join(
+                sitemaps.iter_shard_xml(
+                    pages.filter(
+                        pk__in=[self.page_fullseo.pk, self.page_article.pk]
+                    )
+                )
+            )
+        with CaptureQueriesContext(connection) as many:
+            xml = b"".join(sitemaps.iter_shard_xml(pages))
+        self.assertIn(b"<image:image>", xml)
+        self.assertEqual(len(many), len(one))
+
+    def test_sitemap_dir(self):
+        """
+        Shards should be cached gzipped on disk, and support
+        If-Modified-Since.
+        """
+        with (
+            tempfile.TemporaryDirectory() as tmp,
+            override_settings(WAGTAILSEO_SITEMAP_DIR=tmp),
+        ):
+            url = reverse("wagtailseo_sitemap_shard", args=[0])
+            response = self.client.get(url, HTTP_ACCEPT_ENCODING="gzip")
+            self.assertEqual(response["Content-Encoding"], "gzip")
+            self.assertIn("Accept-Encoding", response["Vary"])
+            xml = gzip.decompress(b"".join(response.streaming_content))
+            self.assertIn(b"<urlset", xml)
+
+            response = self.client.get(url)
+            self.assertFalse(response.has_header("Content-Encoding"))
+            self.assertEqual(b"".join(response.streaming_content), xml)
+
+            response = self.client.get(
+                url, HTTP_IF_MODIFIED_SINCE=response["Last-Modified"]
+            )
+            self.assertEqual(response.status_code, 304)
+
+            # Files are closed with the response, even if never read.
+            file_chunks = []
+
+            def make_file_chunks(f, cls=sitemaps.FileChunks):
+                file_chunks.append(cls(f))
+                return file_chunks[-1]
+
+            # Closing a response sends request_finished, which would close
+            # the test database connection, as the test client avoids.
+            request_finished.disconnect(close_old_connections)
+            try:
+                with mock.patch.object(
+                    sitemaps, "FileChunks", side_effect=make_file_chunks
+                ):
+                    for encoding in ("gzip", ""):
+                        self.client.get(
+                            url, HTTP_ACCEPT_ENCODING=encoding
+                        ).close()
+            finally:
+                request_finished.connect(close_old_connections)
+            self.assertEqual(len(file_chunks), 2)
+            for chunks in file_chunks:
+                self.assertTrue(chunks.f.closed)
+
+    @override_settings(WAGTAILSEO_SITEMAP_SHARD_SIZE=2)
+    def test_sitemap_update(self):
+        """
+        Publishing a page should only write again the shard containing it.
+        """
+        site = Site.objects.get(is_default_site=True)
+        page = SeoPage.objects.get(pk=self.page_lowseo.pk)
+        with (
+            tempfile.TemporaryDirectory() as tmp,
+            override_settings(WAGTAILSEO_SITEMAP_DIR=tmp),
+        ):
+            response = self.client.get(reverse("wagtailseo_sitemap"))
+            self.assertNotContains(response, "<lastmod>")
+            bounds = sitemaps.get_bounds(site)
+            for shard in range(len(bounds)):
+                sitemaps.get_shard_file(site, bounds, shard)
+            response = self.client.get(reverse("wagtailseo_sitemap"))
+            self.assertContains(response, "<lastmod>", count=len(bounds))
+
+            site_dir = sitemaps.get_site_dir(site.pk)
+            shard = sitemaps.get_shard_index(bounds, page.pk)
+            other = 1 if shard == 0 else 0
+            stale = gzip.compress(b"stale")
+            for i in (shard, other):
+                with open(sitemaps.get_shard_path(site_dir, i), "wb") as f:
+                    f.write(stale)
+
+            # Shards are written in the background, run here instead.
+            with (
+                mock.patch(
+                    "wagtailseo.renditions.run_in_background",
+                    side_effect=lambda func, *args: func(*args),
+                ) as run,
+                self.captureOnCommitCallbacks(execute=True),
+            ):
+                page.save_revision().publish()
+            run.assert_called_once_with(sitemaps.update_pages, site, {page.pk})
+            with gzip.open(sitemaps.get_shard_path(site_dir, shard)) as f:
+                xml = f.read().decode("utf8")
+            self.assertIn(
+                "<loc>{0}</loc><lastmod>".format(page.get_full_url()), xml
+            )
+            with open(sitemaps.get_shard_path(site_dir, other), "rb") as f:
+                self.assertEqual(f.read(), stale)
+
+            # Pages queued in a transaction which is rolled back are dropped.
+            with (
+                mock.patch("wagtailseo.renditions.run_in_background") as run,
+                self.captureOnCommitCallbacks(execute=True),
+            ):
+                with self.assertRaises(ValueError), transaction.atomic():
+                    page.save_revision().publish()
+                    raise ValueError
+                self.assertIsNone(signal_handlers.get_sitemap_update())
+                page = SeoPage.objects.get(pk=page.pk)
+                page.save_revision().publish()
+            run.assert_called_once_with(sitemaps.update_pages, site, {page.pk})
+
+            # Deleting pages loads sites, and schedules an update, only once.
+            pages = list(SeoPage.objects.exclude(pk=page.pk)[:2])
+            with (
+                self.captureOnCommitCallbacks() as callbacks,
+                CaptureQueriesContext(connection) as queries,
+            ):
+                for other_page in pages:
+                    other_page.delete()
+            updates = [
+                c
+                for c in callbacks
+                if isinstance(c, signal_handlers.SitemapUpdate)
+            ]
+            self.assertEqual(len(updates), 1)
+            self.assertEqual(updates[0].pages, {site.pk: {p.pk for p in pages}})
+            site_queries = [
+                q
+                for q in queries.captured_queries
+                if q["sql"].startswith('SELECT "wagtailcore_site"."id"')
+                and 'FROM "wagtailcore_site" INNER JOIN' in q["sql"]
+            ]
+            self.assertEqual(len(site_queries), 1)
+
+            # Saving the site deletes the whole sitemap.
+            site.save()
+            self.assertFalse(os.path.exists(site_dir))
+
+
+class TestAuditWorkers(TransactionTestCase):
+    """
+    Audit pages in worker processes, which see only committed pages.
+    """
+
+    serialized_rollback = True
+
+    def test_seo_audit_spawn(self):
+        """
+        Workers started with a fresh interpreter should set Django up before
+        auditing pages.
+        """
+        pages = [
+            Page.objects.get(slug="home").add_child(
+                instance=SeoPage(title="Spawned {0}".format(i), slug=str(i))
+            )
+            for i in range(3)
+        ]
+        executor = functools.partial(
+            ProcessPoolExecutor, mp_context=multiprocessing.get_context("spawn")
+        )
+        out = io.StringIO()
+        with mock.patch.object(seo_audit, "ProcessPoolExecutor", executor):
+            call_command(
+                "seo_audit",
+                workers=2,
+                batch_size=1,
+                stdout=out,
+                stderr=io.StringIO(),
+            )
+        rows = [json.loads(line) for line in out.getvalue().splitlines()]
+        for page in pages:
+            self.assertIn(
+                (page.pk, "description"),
+                {(row["page_id"], row["rule"]) for row in rows},
+            )
 
 
 class TestSettingMenu(WagtailTestUtils, TestCase):
@@ -364,3 +1532,60 @@ class TestSettingMenu(WagtailTestUtils, TestCase):
             response,
             reverse("wagtailsettings:edit", args=("wagtailseo", "seosettings")),
         )
+
+    @override_settings(WAGTAILSEO_CACHE="default")
+    def test_invalid_settings_form(self):
+        """
+        A rejected settings form should not change the settings kept in the
+        process.
+        """
+        self.login()
+        site = Site.objects.get(is_default_site=True)
+        seo_set = SeoSettings.for_site(site)
+        seo_set.twitter_site = "orig"
+        seo_set.save()
+        response = self.client.post(
+            reverse(
+                "wagtailsettings:edit",
+                args=("wagtailseo", "seosettings", site.pk),
+            ),
+            {
+                "twitter_site": "polluted",
+                "struct_org_extra_json": "{",
+                "struct_org_hours-count": 0,
+                "struct_org_actions-count": 0,
+            },
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(SeoSettings.for_site(site).twitter_site, "orig")
+        self.assertEqual(
+            SeoSettings.objects.get(site=site).twitter_site, "orig"
+        )
+
+
+class TestImportTime(SimpleTestCase):
+    """
+    Check what importing wagtailseo loads while serving pages. The time it
+    takes is measured by ``test_benchmarks.ImportBenchmark``.
+    """
+
+    def test_import_models(self):
+        env = dict(os.environ, DJANGO_SETTINGS_MODULE="testproject.settings")
+        proc = subprocess.run(
+            [
+                sys.executable,
+                "-c",
+                "import json, sys, django; django.setup(); "
+                "import wagtailseo.models; print(json.dumps(list(sys.modules)))",
+            ],
+            cwd=os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+            env=env,
+            capture_output=True,
+            text=True,
+            check=True,
+        )
+        modules = json.loads(proc.stdout)
+        self.assertIn("wagtailseo.models", modules)
+        # Only the admin needs these.
+        self.assertNotIn("wagtailseo.views", modules)
+        self.assertNotIn("wagtailseo.wagtail_hooks", modules)
@@ -57,6 +57,7 @@ MIDDLEWARE = [
     "django.middleware.clickjacking.XFrameOptionsMiddleware",
     "django.middleware.security.SecurityMiddleware",
     "wagtail.contrib.redirects.middleware.RedirectMiddleware",
+    "wagtailseo.middleware.SeoRequestMiddleware",
 ]
 
 ROOT_URLCONF = "testproject.urls"
@@ -78,6 +79,16 @@ TEMPLATES = [
             ],
         },
     },
+    {
+        "BACKEND": "django.template.backends.jinja2.Jinja2",
+        "APP_DIRS": True,
+        "OPTIONS": {
+            "extensions": [
+                "wagtail.jinja2tags.core",
+                "wagtailseo.jinja2tags.seo",
+            ],
+        },
+    },
 ]
 
 WSGI_APPLICATION = "testproject.wsgi.application"
@@ -90,6 +101,9 @@ DATABASES = {
     "default": {
         "ENGINE": "django.db.backends.sqlite3",
         "NAME": os.path.join(BASE_DIR, "db.sqlite3"),
+        # A file rather than memory, so that processes started by the tests,
+        # such as seo_audit workers, can use it.
+        "TEST": {"NAME": os.path.join(BASE_DIR, "test_db.sqlite3")},
     }
 }
 
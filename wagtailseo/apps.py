@@ -5,3 +5,8 @@ class WagtailSeoConfig(AppConfig):
     name = "wagtailseo"
     verbose_name = "Wagtail SEO"
     default_auto_field = "django.db.models.AutoField"
+
+    def ready(self):
+        from wagtailseo.signal_handlers import register_signal_handlers
+
+        register_signal_handlers()
@@ -0,0 +1,233 @@
+"""
+Checks of the SEO values of pages, shared by the "SEO Preview" mode, the
+``seo_audit`` management command, and the SEO report in the admin.
+"""
+
+from typing import Callable
+from typing import Iterable
+from typing import List
+from typing import Optional
+from typing import Tuple
+
+from django.contrib.contenttypes.models import ContentType
+from django.core.exceptions import FieldDoesNotExist
+from django.db.models import BooleanField
+from django.db.models import Case
+from django.db.models import Exists
+from django.db.models import OuterRef
+from django.db.models import Q
+from django.db.models import QuerySet
+from django.db.models import Value
+from django.db.models import When
+from django.db.models.functions import Coalesce
+from django.db.models.functions import Length
+from django.db.models.functions import NullIf
+from django.utils.translation import gettext_lazy as _
+from wagtail.images import get_image_model
+from wagtail.models import Page
+from wagtail.models import Site
+from wagtail.models import get_page_models
+
+from wagtailseo import utils
+
+
+TITLE_MAX_LENGTH = 60
+DESCRIPTION_MIN_LENGTH = 50
+DESCRIPTION_MAX_LENGTH = 160
+
+
+def get_title(page) -> str:
+    """
+    Gets the title measured by the ``title`` check: the SEO title of the page,
+    or its title if blank. ``title_expression()`` is its database equivalent.
+    """
+    return page.seo_title or page.title
+
+
+def title_expression() -> Coalesce:
+    """
+    Gets the title measured by the ``title`` check, in the database.
+    """
+    return Coalesce(NullIf("seo_title", Value("")), "title")
+
+
+def check_sitename(page) -> Optional[str]:
+    if not page.seo_sitename:
+        return _("Set site name in Settings > Sites.")
+    return None
+
+
+def check_title(page) -> Optional[str]:
+    if len(get_title(page)) > TITLE_MAX_LENGTH:
+        return _(
+            "Title tag should be shorter than 60 characters (including spaces)."
+        )
+    return None
+
+
+def check_description(page) -> Optional[str]:
+    length = len(page.seo_description)
+    if length < DESCRIPTION_MIN_LENGTH or length > DESCRIPTION_MAX_LENGTH:
+        return _(
+            "Meta description should be between 50 to 160 characters (including spaces)."
+        )
+    return None
+
+
+def check_image(page) -> Optional[str]:
+    if page.seo_image is None:
+        return _("Set a preview image on the page or in Settings > SEO.")
+    return None
+
+
+def check_struct_data(page) -> Optional[str]:
+    if not page.seo_settings.struct_meta:
+        return _("Structured data is turned off in Settings > SEO.")
+    if not page.seo_org_fields.struct_org_type:
+        return _("Set the organization type for structured data.")
+    return None
+
+
+def check_struct_org_extra_json(page) -> Optional[str]:
+    extra_json = page.seo_org_fields.struct_org_extra_json
+    if extra_json and utils.parse_json_object(extra_json) is None:
+        return _("Additional Organization markup is not a valid JSON object.")
+    return None
+
+
+# Every check, by name, in the order they are reported.
+RULES: List[Tuple[str, Callable]] = [
+    ("sitename", check_sitename),
+    ("title", check_title),
+    ("description", check_description),
+    ("image", check_image),
+    ("struct_data", check_struct_data),
+    ("struct_org_extra_json", check_struct_org_extra_json),
+]
+
+# Checks shown in the "SEO Preview" mode.
+PREVIEW_RULES = ("sitename", "title", "description")
+
+
+def get_warnings(
+    page, rules: Optional[Iterable[str]] = None
+) -> List[Tuple[str, str]]:
+    """
+    Runs checks against a page.
+
+    :param page: A page with ``SeoMixin``.
+    :param rules: Names of the checks to run, or None to run all of them.
+    :rtype: List[Tuple[str, str]]
+    :returns: The name and message of each failed check.
+    """
+    if rules is not None:
+        rules = set(rules)
+    warnings = []
+    for name, check in RULES:
+        if rules is not None and name not in rules:
+            continue
+        message = check(page)
+        if message:
+            warnings.append((name, str(message)))
+    return warnings
+
+
+# -- Database checks ----------------------------------------------------------
+
+
+def get_seo_page_models() -> list:
+    """
+    Gets every concrete page model with ``SeoMixin``.
+    """
+    from wagtailseo.models import SeoMixin
+
+    return [m for m in get_page_models() if issubclass(m, SeoMixin)]
+
+
+def get_seo_pages() -> QuerySet:
+    """
+    Gets every page with ``SeoMixin``, as generic ``Page`` objects.
+    """
+    models = get_seo_page_models()
+    if not models:
+        return Page.objects.none()
+    ctypes = ContentType.objects.get_for_models(*models).values()
+    return Page.objects.filter(content_type__in=ctypes)
+
+
+def _has_image_q() -> Q:
+    """
+    Matches pages which have a preview image, either their own, or the default
+    image of their site.
+    """
+    from wagtailseo.models import SeoSettings
+
+    image_model = get_image_model()
+    q = Q()
+    for model in get_seo_page_models():
+        for attr in model.seo_image_sources:
+            try:
+                field = model._meta.get_field(attr)
+            except FieldDoesNotExist:
+                continue
+            if field.is_relation and issubclass(
+                field.related_model, image_model
+            ):
+                q |= Q(
+                    Exists(
+                        model.objects.filter(
+                            pk=OuterRef("pk"), **{attr + "__isnull": False}
+                        )
+                    )
+                )
+    site_ids = SeoSettings.objects.filter(
+        og_image_default__isnull=False
+    ).values_list("site_id", flat=True)
+    for root_path in Site.objects.filter(pk__in=site_ids).values_list(
+        "root_page__path", flat=True
+    ):
+        q |= Q(path__startswith=root_path)
+    return q
+
+
+def annotate_warnings(queryset: QuerySet) -> QuerySet:
+    """
+    Annotates pages with the values checked in the database:
+
+    * ``seo_title_length``: length of the SEO title, or of the title if blank.
+    * ``seo_description_length``: length of the search description.
+    * ``seo_missing_image``: whether the page has no preview image.
+    """
+    has_image = _has_image_q()
+    if has_image:
+        missing_image = Case(
+            When(has_image, then=Value(False)),
+            default=Value(True),
+            output_field=BooleanField(),
+        )
+    else:
+        missing_image = Value(True, output_field=BooleanField())
+    return queryset.annotate(
+        seo_title_length=Length(title_expression()),
+        seo_description_length=Length("search_description"),
+        seo_missing_image=missing_image,
+    )
+
+
+def get_warning_q(rule: Optional[str] = None) -> Q:
+    """
+    Matches pages annotated by ``annotate_warnings`` which fail the ``title``,
+    ``description`` or ``image`` check, or any of them.
+    """
+    rules = {
+        "title": Q(seo_title_length__gt=TITLE_MAX_LENGTH),
+        "description": Q(seo_description_length__lt=DESCRIPTION_MIN_LENGTH)
+        | Q(seo_description_length__gt=DESCRIPTION_MAX_LENGTH),
+        "image": Q(seo_missing_image=True),
+    }
+    if rule is not None:
+        return rules[rule]
+    q = Q()
+    for rule_q in rules.values():
+        q |= rule_q
+    return q
@@ -1,10 +1,14 @@
-import json
+import copy
 
 from django import forms
+from django.core.exceptions import ValidationError
+from django.forms.utils import ErrorList
 from django.utils.translation import gettext_lazy as _
 from wagtail import blocks
+from wagtail.blocks.struct_block import StructBlockValidationError
 
 from wagtailseo import schema
+from wagtailseo import utils
 
 
 class OpenHoursValue(blocks.StructValue):
@@ -89,9 +93,9 @@ class StructuredDataActionValue(blocks.StructValue):
                 }
             )
         if self["extra_json"]:
-            sd_dict.update(
-                json.loads(self["extra_json"]),
-            )
+            # The parsed object is shared, see ``parse_json_object()``.
+            extra = utils.parse_json_object(self["extra_json"]) or {}
+            sd_dict.update(copy.deepcopy(extra))
         return sd_dict
 
 
@@ -140,3 +144,11 @@ class StructuredDataActionBlock(blocks.StructBlock):
             "Must be properties of https://schema.org/Action."
         ),
     )
+
+    def clean(self, value):
+        value = super().clean(value)
+        try:
+            utils.validate_json_object(value["extra_json"])
+        except ValidationError as e:
+            raise StructBlockValidationError({"extra_json": ErrorList([e])})
+        return value
@@ -0,0 +1,199 @@
+"""
+Caching of rendered SEO output in Django's cache framework.
+
+Cached values are keyed on a per-site settings version, which is replaced
+whenever the site's ``SeoSettings`` or ``Site`` are saved, so that every
+cached value derived from them is invalidated at once. Objects kept in each
+process, such as ``SeoSettings``, are checked against the same version.
+Cached metadata of a page is also keyed on a per-page version, which is
+replaced whenever one of the page's images changes.
+"""
+
+import hashlib
+import json
+import threading
+import uuid
+from typing import Callable
+from typing import Dict
+from typing import Iterable
+from typing import Optional
+from typing import Tuple
+
+from django.core.cache import BaseCache
+from django.core.cache import caches
+from django.core.serializers.json import DjangoJSONEncoder
+from django.http import HttpRequest
+from django.utils import translation
+
+from wagtailseo import settings
+
+
+# Seconds a preview is cached. Previews are keyed on the page content, but the
+# rendered page may also show content from elsewhere, so keep this short.
+PREVIEW_TIMEOUT = 300
+
+
+def get_cache() -> Optional[BaseCache]:
+    """
+    Returns the cache configured by ``WAGTAILSEO_CACHE``, or ``None`` if
+    caching is disabled.
+    """
+    alias = settings.get("WAGTAILSEO_CACHE")
+    if not alias:
+        return None
+    return caches[alias]
+
+
+def _settings_version_key(site_id: int) -> str:
+    return "wagtailseo:settings-version:{0}".format(site_id)
+
+
+def _page_version_key(page_id: int) -> str:
+    return "wagtailseo:page-version:{0}".format(page_id)
+
+
+def _get_version(cache: BaseCache, key: str) -> str:
+    version = cache.get(key)
+    if version is None:
+        # If the version was evicted, start a new one rather than risk
+        # reusing an old one.
+        cache.add(key, uuid.uuid4().hex, None)
+        version = cache.get(key)
+    return version
+
+
+# Objects kept in this process, as ``(name, site_id): (version, obj)``.
+_local: Dict[Tuple[str, int], Tuple[str, object]] = {}
+_local_lock = threading.Lock()
+
+
+def get_settings_version(
+    site_id: int, request: Optional[HttpRequest] = None
+) -> str:
+    """
+    Returns the current settings version of a site. When ``request`` is
+    given, the version is only read from the cache once per request.
+    """
+    cache = get_cache()
+    if cache is None:
+        return ""
+    if request is not None:
+        versions = request.__dict__.setdefault("_wagtailseo_versions", {})
+        if site_id not in versions:
+            versions[site_id] = get_settings_version(site_id)
+        return versions[site_id]
+    return _get_version(cache, _settings_version_key(site_id))
+
+
+def bump_settings_version(site_id: int) -> None:
+    """
+    Invalidates everything cached for a site.
+    """
+    cache = get_cache()
+    if cache is None:
+        return
+    cache.set(_settings_version_key(site_id), uuid.uuid4().hex, None)
+
+
+def get_page_version(page_id: int) -> str:
+    """
+    Returns the current version of the cached metadata of a page.
+    """
+    cache = get_cache()
+    if cache is None:
+        return ""
+    return _get_version(cache, _page_version_key(page_id))
+
+
+def bump_page_versions(page_ids: Iterable[int]) -> None:
+    """
+    Invalidates the cached metadata of pages.
+    """
+    cache = get_cache()
+    if cache is None:
+        return
+    cache.set_many(
+        {_page_version_key(pk): uuid.uuid4().hex for pk in page_ids}, None
+    )
+
+
+def get_site_object(
+    name: str,
+    site_id: int,
+    build: Callable[[], object],
+    request: Optional[HttpRequest] = None,
+):
+    """
+    Returns an object built by ``build`` for a site, which is kept in this
+    process until the site's settings version changes. The same object is
+    shared by every thread, so it must not be modified by callers.
+    """
+    if get_cache() is None:
+        return build()
+    version = get_settings_version(site_id, request)
+    key = (name, site_id)
+    with _local_lock:
+        entry = _local.get(key)
+    if entry is not None and entry[0] == version:
+        return entry[1]
+    obj = build()
+    with _local_lock:
+        _local[key] = (version, obj)
+    return obj
+
+
+def make_key(prefix: str, *parts) -> str:
+    """
+    Builds a fixed-length cache key from arbitrary parts.
+    """
+    digest = hashlib.md5(
+        "\x1f".join(str(p) for p in parts).encode("utf8"),
+        usedforsecurity=False,
+    ).hexdigest()
+    return "wagtailseo:{0}:{1}".format(prefix, digest)
+
+
+def get_meta_cache_key(
+    page, template_name: str, path: str = ""
+) -> Optional[str]:
+    """
+    Returns the key under which the rendered ``template_name`` of ``page`` is
+    cached, or ``None`` if it should not be cached. ``path`` is the path of
+    the request, for output which may vary by URL.
+    """
+    url_parts = page.get_url_parts(request=page.seo_request)
+    if not url_parts:
+        return None
+    site_id = url_parts[0]
+    return make_key(
+        "meta",
+        template_name,
+        path,
+        page.pk,
+        page.latest_revision_id,
+        page.url_path,
+        get_settings_version(site_id, page.seo_request),
+        get_page_version(page.pk),
+        settings.get("WAGTAILSEO_SEP"),
+        translation.get_language(),
+    )
+
+
+def get_preview_cache_key(page, request: HttpRequest) -> str:
+    """
+    Returns the key under which the SEO preview context of a draft of
+    ``page`` is cached.
+    """
+    content = json.dumps(
+        page.serializable_data(), cls=DjangoJSONEncoder, sort_keys=True
+    )
+    site = page.seo_site
+    return make_key(
+        "preview",
+        page._meta.label,
+        page.pk,
+        content,
+        get_settings_version(site.pk, request) if site else "",
+        request.get_host(),
+        translation.get_language(),
+    )
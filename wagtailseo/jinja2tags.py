@@ -0,0 +1,57 @@
+import jinja2
+from jinja2.ext import Extension
+
+from wagtailseo import meta
+
+
+@jinja2.pass_context
+def seo_meta(context):
+    """
+    Renders the same metadata as ``wagtailseo/meta.html`` for the current
+    page::
+
+        {{ seo_meta() }}
+    """
+    return meta.render_seo_meta(context.get("self"), context.get("request"))
+
+
+@jinja2.pass_context
+def seo_struct_data(context):
+    """
+    Renders the same Article structured data as
+    ``wagtailseo/struct_data.html`` for the current page::
+
+        {{ seo_struct_data() }}
+    """
+    return meta.render_seo_struct_data(
+        context.get("self"), context.get("request")
+    )
+
+
+@jinja2.pass_context
+def seo_struct_org_data(context):
+    """
+    Renders the same Organization structured data as
+    ``wagtailseo/struct_org_data.html`` for the current page::
+
+        {{ seo_struct_org_data() }}
+    """
+    return meta.render_seo_struct_org_data(
+        context.get("self"), context.get("request")
+    )
+
+
+class WagtailSeoExtension(Extension):
+    def __init__(self, environment):
+        super().__init__(environment)
+        self.environment.globals.update(
+            {
+                "seo_meta": seo_meta,
+                "seo_struct_data": seo_struct_data,
+                "seo_struct_org_data": seo_struct_org_data,
+            }
+        )
+
+
+# Nicer import names
+seo = WagtailSeoExtension
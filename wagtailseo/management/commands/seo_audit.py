@@ -0,0 +1,180 @@
+"""
+Audits the SEO values of every live page.
+
+Workers which are not forked import this module before Django is set up, so
+it must not import models at the top level.
+"""
+
+import csv
+import json
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict
+from typing import Iterator
+from typing import List
+from typing import Tuple
+
+import django
+from django.apps import apps
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.core.management.base import CommandError
+from django.db import connections
+
+
+FIELDS = ["page_id", "url", "title", "rule", "message"]
+
+
+def get_page_ids() -> List[int]:
+    """
+    Gets the IDs of every live page with ``SeoMixin``, in order.
+    """
+    from wagtailseo import audit
+
+    return list(
+        audit.get_seo_pages().live().order_by("pk").values_list("pk", flat=True)
+    )
+
+
+def audit_pages(ids: List[int]) -> Tuple[int, List[dict]]:
+    """
+    Audits a batch of pages, with a fixed number of queries.
+
+    :returns: The number of pages audited, and a row for each warning.
+    """
+    from wagtail.models import Page
+
+    from wagtailseo import audit
+    from wagtailseo.models import prefetch_seo_renditions
+
+    pages = prefetch_seo_renditions(
+        Page.objects.filter(pk__in=ids).order_by("pk").specific()
+    )
+    rows = []
+    for page in pages:
+        for rule, message in audit.get_warnings(page):
+            rows.append(
+                {
+                    "page_id": page.pk,
+                    "url": page.get_full_url(),
+                    "title": page.title,
+                    "rule": rule,
+                    "message": message,
+                }
+            )
+    return len(pages), rows
+
+
+def init_worker(db_names: Dict[str, str]):
+    # Workers which are not forked start with a fresh interpreter, and must
+    # use the same databases as the command, such as those of the test runner.
+    if not apps.ready:
+        for alias, name in db_names.items():
+            settings.DATABASES[alias]["NAME"] = name
+        django.setup()
+
+
+class Command(BaseCommand):
+    help = (
+        "Checks every live page for SEO issues, such as titles or "
+        "descriptions of the wrong length and missing preview images."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--format",
+            choices=["jsonl", "csv"],
+            default="jsonl",
+            help="Output format. Default is JSON Lines.",
+        )
+        parser.add_argument(
+            "--output",
+            help="File to write to. Default is standard output.",
+        )
+        parser.add_argument(
+            "--workers",
+            type=int,
+            default=0,
+            help=(
+                "Number of processes auditing pages, for example the number "
+                "of CPUs. Default is 0, to audit in this process."
+            ),
+        )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=500,
+            help="Number of pages loaded at a time. Default is 500.",
+        )
+
+    def handle(self, *args, **options):
+        batch_size = options["batch_size"]
+        if batch_size < 1:
+            raise CommandError("--batch-size must be at least 1.")
+
+        ids = get_page_ids()
+        batches = [
+            ids[i : i + batch_size] for i in range(0, len(ids), batch_size)
+        ]
+
+        if options["output"]:
+            out = open(options["output"], "w", newline="", encoding="utf8")
+        else:
+            out = self.stdout
+        if options["format"] == "csv":
+            writer = csv.DictWriter(out, FIELDS, lineterminator="\n")
+            writer.writeheader()
+            write = writer.writerow
+        else:
+
+            def write(row):
+                out.write(json.dumps(row) + "\n")
+
+        num_pages = 0
+        num_warnings = 0
+        try:
+            for count, rows in self.iter_results(batches, options["workers"]):
+                num_pages += count
+                num_warnings += len(rows)
+                for row in rows:
+                    write(row)
+        finally:
+            if out is not self.stdout:
+                out.close()
+
+        self.stderr.write(
+            "Audited {0} pages, found {1} warnings.".format(
+                num_pages, num_warnings
+            ),
+            style_func=self.style.SUCCESS,
+        )
+
+    def iter_results(
+        self, batches: List[List[int]], workers: int
+    ) -> Iterator[Tuple[int, List[dict]]]:
+        """
+        Audits each batch of pages, in order. Only a few batches are in
+        flight at once, to keep memory use bounded.
+        """
+        if workers <= 1:
+            for ids in batches:
+                yield audit_pages(ids)
+            return
+
+        # Forked workers must open their own database connections.
+        db_names = {
+            conn.alias: conn.settings_dict["NAME"] for conn in connections.all()
+        }
+        connections.close_all()
+        with ProcessPoolExecutor(
+            max_workers=workers,
+            initializer=init_worker,
+            initargs=(db_names,),
+        ) as executor:
+            pending: deque = deque()
+            for ids in batches:
+                pending.append(executor.submit(audit_pages, ids))
+                if len(pending) >= workers * 2:
+                    yield pending.popleft().result()
+            while pending:
+                yield pending.popleft().result()
@@ -0,0 +1,137 @@
+"""
+Renders the metadata of ``wagtailseo/meta.html``, and the structured data of
+``wagtailseo/struct_data.html`` and ``wagtailseo/struct_org_data.html``,
+without the template engine, for the ``{% seo_meta %}`` template tag, Jinja2,
+and headless use.
+
+Tags are assembled from pre-escaped strings by the ``get_seo_html_tags()``,
+``get_seo_og_tags()`` and ``get_seo_twitter_tags()`` methods of
+``SeoMixin``, which pages can override as they would the blocks of
+``meta.html``.
+"""
+
+from datetime import datetime
+from typing import Optional
+
+from django.http import HttpRequest
+from django.utils import dateformat
+from django.utils import timezone
+from django.utils.html import conditional_escape
+from django.utils.safestring import SafeString
+from django.utils.safestring import mark_safe
+
+from wagtailseo import cache
+from wagtailseo import timing
+
+
+# Name under which the output is cached and timed.
+NAME = "seo_meta"
+
+# Wraps JSON-LD, as rendered by the structured data templates.
+SCRIPT = '<script type="application/ld+json">\n  {0}\n</script>'
+
+
+def meta_tag(attr: str, key: str, value) -> str:
+    """
+    Returns a ``<meta>`` tag with ``attr="key"`` and the escaped ``value`` as
+    its content.
+    """
+    return '<meta {0}="{1}" content="{2}" />'.format(
+        attr, key, conditional_escape(value)
+    )
+
+
+def format_datetime(value: Optional[datetime]) -> str:
+    """
+    Formats ``value`` in ISO 8601 in the current time zone, as the ``date:'c'``
+    template filter does.
+    """
+    if not value:
+        return ""
+    if timezone.is_aware(value):
+        value = timezone.localtime(value)
+    return dateformat.format(value, "c")
+
+
+def build_seo_meta(page) -> str:
+    """
+    Returns the metadata of ``page``, or an empty string if it does not
+    appear to be a wagtail-seo page.
+    """
+    seo = getattr(page, "seo_meta", None)
+    if not seo or not seo.pagetitle:
+        return ""
+    tags = page.get_seo_html_tags(seo)
+    tags += page.get_seo_og_tags(seo)
+    tags += page.get_seo_twitter_tags(seo)
+    return "\n".join(tags)
+
+
+def _get_cache_key(page) -> Optional[str]:
+    if not hasattr(page, "seo_meta") or not page.live:
+        return None
+    if getattr(page, "_seo_preview", False):
+        return None
+    if getattr(page.seo_request, "is_preview", False):
+        return None
+    return cache.get_meta_cache_key(page, NAME)
+
+
+@timing.timed(NAME)
+def render_seo_meta(page, request: Optional[HttpRequest] = None) -> SafeString:
+    """
+    Renders the same tags as ``wagtailseo/meta.html`` for ``page``. The
+    output is cached when ``WAGTAILSEO_CACHE`` is enabled.
+
+    :param request: The current request, if not already bound to ``page``.
+    """
+    if request is not None and hasattr(page, "bind_seo_request"):
+        page.bind_seo_request(request)
+    backend = cache.get_cache()
+    if backend is None:
+        return mark_safe(build_seo_meta(page))
+    key = _get_cache_key(page)
+    if key is None:
+        return mark_safe(build_seo_meta(page))
+    html = backend.get(key)
+    if html is None:
+        html = build_seo_meta(page)
+        backend.set(key, html)
+    return mark_safe(html)
+
+
+def render_seo_struct_data(
+    page, request: Optional[HttpRequest] = None
+) -> SafeString:
+    """
+    Renders the same Article structured data as
+    ``wagtailseo/struct_data.html`` for ``page``.
+
+    :param request: The current request, if not already bound to ``page``.
+    """
+    if not hasattr(page, "seo_struct_article_json"):
+        return mark_safe("")
+    if request is not None:
+        page.bind_seo_request(request)
+    if page.seo_og_type != "article" or not page.seo_settings.struct_meta:
+        return mark_safe("")
+    return mark_safe(SCRIPT.format(page.seo_struct_article_json))
+
+
+def render_seo_struct_org_data(
+    page, request: Optional[HttpRequest] = None
+) -> SafeString:
+    """
+    Renders the same Organization structured data as
+    ``wagtailseo/struct_org_data.html`` for ``page``.
+
+    :param request: The current request, if not already bound to ``page``.
+    """
+    if not hasattr(page, "seo_struct_org_json"):
+        return mark_safe("")
+    if request is not None:
+        page.bind_seo_request(request)
+    seo_settings = page.seo_settings
+    if not seo_settings.struct_org_type or not seo_settings.struct_meta:
+        return mark_safe("")
+    return mark_safe(SCRIPT.format(page.seo_struct_org_json))
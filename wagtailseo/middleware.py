@@ -0,0 +1,30 @@
+from wagtailseo import timing
+from wagtailseo import utils
+
+
+class SeoRequestMiddleware:
+    """
+    Makes the current request available to ``SeoMixin`` pages, so that Site,
+    site root path, and ``SeoSettings`` lookups are shared with the rest of the
+    request, even when pages are rendered outside of their own ``serve()``.
+
+    When ``WAGTAILSEO_TIMING`` is enabled, also reports the time and queries
+    taken by SEO computations in a ``Server-Timing`` header.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        token = utils.current_request.set(request)
+        try:
+            response = self.get_response(request)
+        finally:
+            utils.current_request.reset(token)
+        timings = timing.get_timings(request)
+        if timings:
+            value = timing.get_server_timing(timings)
+            if response.has_header("Server-Timing"):
+                value = response["Server-Timing"] + ", " + value
+            response["Server-Timing"] = value
+        return response
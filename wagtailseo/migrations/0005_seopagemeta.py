@@ -0,0 +1,41 @@
+# Generated by Django 5.2.18 on 2026-10-18 18:56
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('wagtailcore', '0052_pagelogentry'),
+        ('wagtailseo', '0004_seosettings_og_image_default'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SeoPageMeta',
+            fields=[
+                ('page', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='+', serialize=False, to='wagtailcore.page')),
+                ('revision_id', models.PositiveIntegerField(blank=True, null=True)),
+                ('author', models.TextField(blank=True)),
+                ('canonical_url', models.TextField(blank=True)),
+                ('description', models.TextField(blank=True)),
+                ('image_url', models.TextField(blank=True)),
+                ('modified_at', models.DateTimeField(blank=True, null=True)),
+                ('og_meta', models.BooleanField(default=True)),
+                ('og_type', models.CharField(blank=True, max_length=255)),
+                ('pagetitle', models.TextField(blank=True)),
+                ('published_at', models.DateTimeField(blank=True, null=True)),
+                ('sitename', models.TextField(blank=True)),
+                ('struct_meta', models.BooleanField(default=True)),
+                ('twitter_card', models.CharField(blank=True, max_length=255)),
+                ('twitter_meta', models.BooleanField(default=True)),
+                ('twitter_site', models.CharField(blank=True, max_length=255)),
+                ('struct_article_json', models.TextField(blank=True)),
+                ('struct_org_json', models.TextField(blank=True)),
+            ],
+            options={
+                'verbose_name': 'SEO page metadata',
+            },
+        ),
+    ]
@@ -1,12 +1,22 @@
-import json
+import asyncio
+import copy
 import re
 from datetime import datetime
 from enum import Enum
 from functools import cached_property
+from typing import Callable
+from typing import Iterable
+from typing import List
 from typing import Optional
+from typing import Tuple
 
-from bs4 import BeautifulSoup
+from asgiref.sync import sync_to_async
+from django.contrib.auth import get_user_model
+from django.core.exceptions import FieldDoesNotExist
+from django.core.exceptions import ValidationError
 from django.db import models
+from django.http import HttpRequest
+from django.utils.html import conditional_escape
 from django.utils.translation import gettext_lazy as _
 from wagtail import VERSION as WAG_VERSION
 from wagtail.admin.panels import FieldPanel
@@ -14,15 +24,23 @@ from wagtail.admin.panels import HelpPanel
 from wagtail.admin.panels import MultiFieldPanel
 from wagtail.contrib.settings.models import register_setting
 from wagtail.fields import StreamField
+from wagtail.images import get_image_model
 from wagtail.images import get_image_model_string
 from wagtail.images.models import AbstractImage
 from wagtail.models import Page
+from wagtail.models import Site
 
+from wagtailseo import audit
+from wagtailseo import cache
+from wagtailseo import renditions
 from wagtailseo import schema
 from wagtailseo import settings
+from wagtailseo import timing
 from wagtailseo import utils
 from wagtailseo.blocks import OpenHoursBlock
 from wagtailseo.blocks import StructuredDataActionBlock
+from wagtailseo.meta import format_datetime
+from wagtailseo.meta import meta_tag
 
 
 # Wagtail 3
@@ -41,6 +59,10 @@ if WAG_VERSION[0] >= 5:
     slug_field_kwargs = {"widget": SlugInput}
 
 
+# Stands in for the page URL in organization data shared between pages.
+ORG_URL_PLACEHOLDER = "wagtailseo:url"
+
+
 class SeoType(Enum):
     ARTICLE = "article"
     WEBSITE = "website"
@@ -53,6 +75,64 @@ class TwitterCard(Enum):
     SUMMARY = "summary"
 
 
+class SeoMeta:
+    """
+    Immutable snapshot of the SEO values of a page, as rendered in
+    ``wagtailseo/meta.html``. Each value is resolved once from the
+    corresponding ``SeoMixin`` property, so that templates can read them
+    repeatedly without re-running any queries.
+    """
+
+    __slots__ = (
+        "author",
+        "canonical_url",
+        "description",
+        "image_url",
+        "modified_at",
+        "og_meta",
+        "og_type",
+        "pagetitle",
+        "published_at",
+        "sitename",
+        "struct_meta",
+        "twitter_card",
+        "twitter_meta",
+        "twitter_site",
+    )
+
+    author: str
+    canonical_url: str
+    description: str
+    image_url: str
+    modified_at: Optional[datetime]
+    og_meta: bool
+    og_type: str
+    pagetitle: str
+    published_at: Optional[datetime]
+    sitename: str
+    struct_meta: bool
+    twitter_card: str
+    twitter_meta: bool
+    twitter_site: str
+
+    def __init__(self, **kwargs):
+        for name in self.__slots__:
+            object.__setattr__(self, name, kwargs.pop(name))
+        if kwargs:
+            raise TypeError(
+                "Unexpected SeoMeta values: {0}".format(", ".join(kwargs))
+            )
+
+    def __setattr__(self, name, value):
+        raise AttributeError("SeoMeta is immutable.")
+
+    def __delattr__(self, name):
+        raise AttributeError("SeoMeta is immutable.")
+
+    def __repr__(self):
+        return "<SeoMeta: {0}>".format(self.pagetitle)
+
+
 class SeoOrgFields(models.Model):
     """
     Mixin which contains data about the organization. Most likely,
@@ -183,6 +263,24 @@ class SeoOrgFields(models.Model):
         ),
     )
 
+    def clean(self):
+        super().clean()
+        try:
+            utils.validate_json_object(self.struct_org_extra_json)
+        except ValidationError as e:
+            raise ValidationError({"struct_org_extra_json": e})
+
+    @property
+    def struct_org_extra_dict(self) -> dict:
+        """
+        Gets a copy of ``struct_org_extra_json`` as a dictionary, parsed once
+        per process. Invalid JSON saved before it was validated is ignored.
+        """
+        if not self.struct_org_extra_json:
+            return {}
+        extra = utils.parse_json_object(self.struct_org_extra_json) or {}
+        return copy.deepcopy(extra)
+
     seo_struct_panels = [
         MultiFieldPanel(
             [
@@ -282,6 +380,45 @@ class SeoSettings(SeoOrgFields, BaseSiteSetting):
     class Meta:
         verbose_name = _("SEO")
 
+    select_related = ["og_image_default", "struct_org_logo", "struct_org_image"]
+
+    @classmethod
+    def for_site(cls, site: Site, request: Optional[HttpRequest] = None):
+        """
+        Gets the settings of ``site``. When ``WAGTAILSEO_CACHE`` is enabled,
+        they are kept in this process along with their images, until the
+        site's settings version changes. Each caller gets its own copy, as
+        the admin edits the instance returned here.
+        """
+        if site is None:
+            return super().for_site(site)
+        if cache.get_cache() is None:
+            return super().for_site(site)
+        return copy.copy(
+            cache.get_site_object(
+                "settings",
+                site.pk,
+                lambda: super(SeoSettings, cls).for_site(site),
+                request=request,
+            )
+        )
+
+    @classmethod
+    def for_request(cls, request: HttpRequest):
+        """
+        Gets the settings of the request's site, once per request.
+        """
+        if cache.get_cache() is None:
+            return super().for_request(request)
+        attr_name = cls.get_cache_attr_name()
+        if hasattr(request, attr_name):
+            return getattr(request, attr_name)
+        site_settings = cls.for_site(
+            Site.find_for_request(request), request=request
+        )
+        setattr(request, attr_name, site_settings)
+        return site_settings
+
     og_meta = models.BooleanField(
         default=True,
         verbose_name=_("Use Open Graph Markup"),
@@ -347,6 +484,84 @@ class SeoSettings(SeoOrgFields, BaseSiteSetting):
     ] + SeoOrgFields.seo_struct_panels
 
 
+class SeoPageMeta(models.Model):
+    """
+    The fully resolved SEO values of a live ``SeoMixin`` page, stored when the
+    page is published so that they can be rendered with a single query.
+    Only used when ``WAGTAILSEO_STORE_META`` is enabled.
+    """
+
+    class Meta:
+        verbose_name = _("SEO page metadata")
+
+    page = models.OneToOneField(
+        "wagtailcore.Page",
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name="+",
+    )
+    # The live revision these values were resolved from.
+    revision_id = models.PositiveIntegerField(null=True, blank=True)
+
+    author = models.TextField(blank=True)
+    canonical_url = models.TextField(blank=True)
+    description = models.TextField(blank=True)
+    image_url = models.TextField(blank=True)
+    modified_at = models.DateTimeField(null=True, blank=True)
+    og_meta = models.BooleanField(default=True)
+    og_type = models.CharField(blank=True, max_length=255)
+    pagetitle = models.TextField(blank=True)
+    published_at = models.DateTimeField(null=True, blank=True)
+    sitename = models.TextField(blank=True)
+    struct_meta = models.BooleanField(default=True)
+    twitter_card = models.CharField(blank=True, max_length=255)
+    twitter_meta = models.BooleanField(default=True)
+    twitter_site = models.CharField(blank=True, max_length=255)
+
+    struct_article_json = models.TextField(blank=True)
+    struct_org_json = models.TextField(blank=True)
+
+    @classmethod
+    def store(cls, page: "SeoMixin") -> "SeoPageMeta":
+        """
+        Resolves and saves the SEO values of ``page``.
+        """
+        # Make sure everything is computed from the page itself, and not
+        # from a previously stored row.
+        page.__dict__["seo_stored_meta"] = None
+
+        meta = page.get_seo_meta()
+        defaults = {name: getattr(meta, name) for name in SeoMeta.__slots__}
+
+        struct_article_json = ""
+        struct_org_json = ""
+        if meta.struct_meta:
+            if meta.og_type == SeoType.ARTICLE.value:
+                struct_article_json = page.seo_struct_article_json
+            if page.seo_settings.struct_org_type:
+                struct_org_json = page.seo_struct_org_json
+
+        defaults.update(
+            {
+                "revision_id": page.live_revision_id,
+                "struct_article_json": struct_article_json,
+                "struct_org_json": struct_org_json,
+            }
+        )
+        obj, _created = cls.objects.update_or_create(
+            page_id=page.pk, defaults=defaults
+        )
+        return obj
+
+    def as_seo_meta(self) -> SeoMeta:
+        """
+        Returns the stored values as a ``SeoMeta`` snapshot.
+        """
+        return SeoMeta(
+            **{name: getattr(self, name) for name in SeoMeta.__slots__}
+        )
+
+
 class SeoMixin(SeoMetaFields, Page):
     """
     Contains fields for SEO-related attributes on a Page model.
@@ -363,22 +578,46 @@ class SeoMixin(SeoMetaFields, Page):
             ("wagtail-seo", _("SEO Preview")),
         ]
 
+    def get_context(self, request, *args, **kwargs):
+        self.bind_seo_request(request)
+        return super().get_context(request, *args, **kwargs)
+
+    def serve_preview(self, request, mode_name):
+        # Previews must never render metadata stored or cached from the live
+        # page.
+        self._seo_preview = True
+        return super().serve_preview(request, mode_name)
+
     def get_preview_context(self, request, mode_name):
         ctx = super().get_preview_context(request, mode_name)
         if mode_name != "wagtail-seo":
             return ctx
 
-        # Render a normal preview, so we can parse some stuff from the HTML.
+        # Editors refresh the preview constantly, so share it between
+        # refreshes of the same draft when caching is enabled.
+        backend = cache.get_cache()
+        key = None
+        if backend is not None:
+            key = cache.get_preview_cache_key(self, request)
+            seo_ctx = backend.get(key)
+            if seo_ctx is not None:
+                ctx.update(seo_ctx)
+                return ctx
+
+        seo_ctx = self.get_seo_preview_context(request)
+        if backend is not None and key is not None:
+            backend.set(key, seo_ctx, cache.PREVIEW_TIMEOUT)
+        ctx.update(seo_ctx)
+        return ctx
+
+    def get_seo_preview_context(self, request) -> dict:
+        """
+        Gets the context added to the "SEO Preview" mode.
+        """
+        # Render a normal preview, to show the tags it actually emits.
         pre = self.serve_preview(request, self.default_preview_mode)
         pre.render()
-        soup = BeautifulSoup(pre.content)
-        icon_link = soup.find("link", rel="icon")
-        if icon_link and hasattr(icon_link, "get"):
-            icon_href = icon_link.get("href")  # type: ignore
-        elif icon_link:
-            icon_href = icon_link["href"]  # type: ignore
-        else:
-            icon_href = None
+        head = utils.get_head_tags(pre)
 
         # Extract the base domain from the full URL.
         match = re.search(
@@ -390,30 +629,17 @@ class SeoMixin(SeoMetaFields, Page):
         else:
             site_domain = self.seo_canonical_url
 
-        # Check for warnings.
-        warnings = []
-        if not self.seo_sitename:
-            warnings.append(_("Set site name in Settings > Sites."))
-        if len(self.seo_title) > 60:
-            warnings.append(
-                _(
-                    "Title tag should be shorter than 60 characters (including spaces)."
+        return {
+            "seo_favicon": head.get("icon"),
+            "seo_head": head,
+            "seo_site_domain": site_domain,
+            "seo_warnings": [
+                message
+                for _name, message in audit.get_warnings(
+                    self, audit.PREVIEW_RULES
                 )
-            )
-        if len(self.seo_description) < 50 or len(self.seo_description) > 160:
-            warnings.append(
-                _(
-                    "Meta description should be between 50 to 160 characters (including spaces)."
-                )
-            )
-        ctx.update(
-            {
-                "seo_favicon": icon_href,
-                "seo_site_domain": site_domain,
-                "seo_warnings": warnings,
-            }
-        )
-        return ctx
+            ],
+        }
 
     def get_preview_template(self, request, mode_name):
         if mode_name == "wagtail-seo":
@@ -422,6 +648,257 @@ class SeoMixin(SeoMetaFields, Page):
 
     # -- SEO properties -------------------------------------------------------
 
+    @property
+    def seo_request(self) -> Optional[HttpRequest]:
+        """
+        Gets the request this page is being rendered for, if known. It is used
+        to share Site, site root path, and ``SeoSettings`` lookups with the
+        rest of the request.
+        """
+        request = self.__dict__.get("_seo_request")
+        if request is None:
+            request = utils.get_current_request()
+        return request
+
+    def bind_seo_request(self, request: Optional[HttpRequest]) -> None:
+        """
+        Sets the request this page is being rendered for.
+        """
+        self._seo_request = request
+
+    @cached_property
+    def seo_site(self) -> Optional[Site]:
+        """
+        Gets the Site this page belongs to, looked up once per instance.
+        """
+        request = self.seo_request
+        if request is None:
+            return self.get_site()
+        url_parts = self.get_url_parts(request=request)
+        if url_parts is None:
+            return None
+        site_id = url_parts[0]
+        site = Site.find_for_request(request)
+        if site is not None and site.pk == site_id:
+            return site
+        return Site.objects.get(id=site_id)
+
+    @cached_property
+    def seo_settings(self) -> SeoSettings:
+        """
+        Gets the ``SeoSettings`` of this page's Site, looked up once per
+        instance.
+        """
+        request = self.seo_request
+        site = self.seo_site
+        if request is not None and site is not None:
+            if site == Site.find_for_request(request):
+                return SeoSettings.for_request(request)
+        return SeoSettings.for_site(site=site, request=request)
+
+    @timing.timed("get_seo_meta")
+    def get_seo_meta(self, request: Optional[HttpRequest] = None) -> SeoMeta:
+        """
+        Resolves every value rendered by ``wagtailseo/meta.html`` into an
+        immutable ``SeoMeta`` snapshot. Each ``seo_*`` property is read
+        exactly once, so overriding those properties is still respected.
+
+        :param HttpRequest request: The current request, if not already bound
+            to this page.
+        """
+        if request is not None:
+            self.bind_seo_request(request)
+        seo_settings = self.seo_settings
+        # Resolving the image URL may generate renditions, only do so if the
+        # image is rendered.
+        image_url = ""
+        if seo_settings.og_meta or seo_settings.twitter_meta:
+            image_url = self.seo_image_url
+        return SeoMeta(
+            author=self.seo_author,
+            canonical_url=self.seo_canonical_url,
+            description=self.seo_description,
+            image_url=image_url,
+            modified_at=self.last_published_at,
+            og_meta=seo_settings.og_meta,
+            og_type=self.seo_og_type,
+            pagetitle=self.seo_pagetitle,
+            published_at=self.seo_published_at,
+            sitename=self.seo_sitename,
+            struct_meta=seo_settings.struct_meta,
+            twitter_card=self.seo_twitter_card_content,
+            twitter_meta=seo_settings.twitter_meta,
+            twitter_site=seo_settings.at_twitter_site,
+        )
+
+    async def aget_seo_meta(
+        self, request: Optional[HttpRequest] = None
+    ) -> SeoMeta:
+        """
+        Asynchronous version of ``get_seo_meta()``. The ``SeoSettings``, the
+        owner, and the images of ``seo_image_sources`` along with their
+        existing renditions are loaded concurrently, so that the snapshot is
+        then resolved without further queries.
+
+        :param HttpRequest request: The current request, if not already bound
+            to this page.
+        """
+        if request is not None:
+            self.bind_seo_request(request)
+        await asyncio.gather(
+            self._aload_seo_settings(),
+            self._aload_seo_owner(),
+            self._aload_seo_images(),
+        )
+        return await sync_to_async(self.get_seo_meta)()
+
+    async def _aload_seo_settings(self) -> None:
+        # The Site and settings are found through Wagtail's caches, which
+        # only have a synchronous API.
+        def load():
+            return self.seo_settings.og_image_default
+
+        default = await sync_to_async(load)()
+        if default:
+            await renditions.aprefetch_renditions(
+                [default], utils.SEO_RENDITION_FILTERS
+            )
+
+    async def _aload_seo_owner(self) -> None:
+        field = self._meta.get_field("owner")
+        if self.owner_id and not field.is_cached(self):
+            self.owner = await get_user_model().objects.aget(pk=self.owner_id)
+
+    async def _aload_seo_images(self) -> None:
+        image_model = get_image_model()
+        fields = []
+        for attr in self.seo_image_sources:
+            try:
+                field = self._meta.get_field(attr)
+            except FieldDoesNotExist:
+                continue
+            if field.is_relation and issubclass(
+                field.related_model, image_model
+            ):
+                fields.append(field)
+        image_ids = {
+            getattr(self, field.attname)
+            for field in fields
+            if getattr(self, field.attname) and not field.is_cached(self)
+        }
+        if image_ids:
+            images = {}
+            async for image in image_model.objects.filter(pk__in=image_ids):
+                images[image.pk] = image
+            for field in fields:
+                image_id = getattr(self, field.attname)
+                if image_id in images:
+                    setattr(self, field.name, images[image_id])
+        await renditions.aprefetch_renditions(
+            [
+                getattr(self, field.name)
+                for field in fields
+                if getattr(self, field.attname) and field.is_cached(self)
+            ],
+            utils.SEO_RENDITION_FILTERS,
+        )
+
+    @cached_property
+    def seo_stored_meta(self) -> Optional[SeoPageMeta]:
+        """
+        Gets the ``SeoPageMeta`` stored when this page was last published, if
+        ``WAGTAILSEO_STORE_META`` is enabled and the stored values are still
+        current.
+        """
+        if not settings.get("WAGTAILSEO_STORE_META") or not self.live:
+            return None
+        if getattr(self, "_seo_preview", False):
+            return None
+        try:
+            stored = SeoPageMeta.objects.get(page_id=self.pk)
+        except SeoPageMeta.DoesNotExist:
+            return None
+        if stored.revision_id != self.live_revision_id:
+            return None
+        return stored
+
+    @cached_property
+    def seo_meta(self) -> SeoMeta:
+        """
+        The ``SeoMeta`` snapshot of this page, computed on first access.
+        """
+        stored = self.seo_stored_meta
+        if stored is not None:
+            return stored.as_seo_meta()
+        return self.get_seo_meta()
+
+    def get_seo_html_tags(self, seo: SeoMeta) -> List[str]:
+        """
+        Gets the standard metadata tags rendered by ``{% seo_meta %}``, as
+        pre-escaped HTML. Override in your Page model as necessary, as you
+        would the ``html_seo_base`` and ``html_seo_extra`` blocks of
+        ``wagtailseo/meta.html``.
+        """
+        tags = [
+            "<title>{0}</title>".format(conditional_escape(seo.pagetitle)),
+            '<link rel="canonical" href="{0}">'.format(
+                conditional_escape(seo.canonical_url)
+            ),
+            meta_tag("name", "description", seo.description),
+        ]
+        if seo.og_type == SeoType.ARTICLE.value and seo.author:
+            tags.append(meta_tag("name", "author", seo.author))
+        return tags
+
+    def get_seo_og_tags(self, seo: SeoMeta) -> List[str]:
+        """
+        Gets the Open Graph tags rendered by ``{% seo_meta %}``, as
+        pre-escaped HTML. Override in your Page model as necessary.
+        """
+        if not seo.og_meta:
+            return []
+        tags = [
+            meta_tag("property", "og:title", seo.pagetitle),
+            meta_tag("property", "og:description", seo.description),
+            meta_tag("property", "og:image", seo.image_url),
+            meta_tag("property", "og:site_name", seo.sitename),
+            meta_tag("property", "og:url", seo.canonical_url),
+            meta_tag("property", "og:type", seo.og_type),
+        ]
+        if seo.og_type == SeoType.ARTICLE.value:
+            if seo.author:
+                tags.append(meta_tag("property", "article:author", seo.author))
+            tags.append(
+                meta_tag(
+                    "property",
+                    "article:published_time",
+                    format_datetime(seo.published_at),
+                )
+            )
+            tags.append(
+                meta_tag(
+                    "property",
+                    "article:modified_time",
+                    format_datetime(seo.modified_at),
+                )
+            )
+        return tags
+
+    def get_seo_twitter_tags(self, seo: SeoMeta) -> List[str]:
+        """
+        Gets the Twitter tags rendered by ``{% seo_meta %}``, as pre-escaped
+        HTML. Override in your Page model as necessary.
+        """
+        if not seo.twitter_meta:
+            return []
+        return [
+            meta_tag("name", "twitter:card", seo.twitter_card),
+            meta_tag("name", "twitter:title", seo.pagetitle),
+            meta_tag("name", "twitter:image", seo.image_url),
+            meta_tag("name", "twitter:description", seo.description),
+            meta_tag("name", "twitter:site", seo.twitter_site),
+        ]
+
     @property
     def seo_author(self) -> str:
         """
@@ -443,7 +920,7 @@ class SeoMixin(SeoMetaFields, Page):
                 url = getattr(self, attr)
                 if url:
                     return url
-        return self.get_full_url()
+        return self.get_full_url(request=self.seo_request)
 
     @property
     def seo_description(self) -> str:
@@ -468,22 +945,57 @@ class SeoMixin(SeoMetaFields, Page):
                 image = getattr(self, attr)
                 if isinstance(image, AbstractImage):
                     return image
-        default = SeoSettings.for_site(site=self.get_site()).og_image_default
+        default = self.seo_settings.og_image_default
         if default:
             return default
         return None
 
     @property
+    def seo_image_filters(self) -> Tuple[str, ...]:
+        """
+        Gets the rendition filter specs of ``seo_image`` used by this page,
+        which are generated together from a single read of the image.
+        """
+        if (
+            self.seo_og_type == SeoType.ARTICLE.value
+            and self.seo_settings.struct_meta
+        ):
+            return utils.SEO_RENDITION_FILTERS
+        return ("original",)
+
+    @property
+    @timing.timed("seo_image_url")
     def seo_image_url(self) -> str:
         """
         Gets the absolute URL for the primary Open Graph image of this page.
         """
-        if self.seo_image:
-            url = self.seo_image.get_rendition("original").url
-            base_url = utils.get_absolute_media_url(self.get_site())
+        image = self.seo_image
+        if image:
+            urls = renditions.get_rendition_urls(image, self.seo_image_filters)
+            url = urls["original"]
+            base_url = utils.get_absolute_media_url(self.seo_site)
             return utils.ensure_absolute_url(url, base_url)
         return ""
 
+    @property
+    def seo_sitemap_image_urls(self) -> List[str]:
+        """
+        Gets the absolute URLs of the images listed for this page in the image
+        sitemap: ``seo_image``, along with its structured data renditions if
+        the page has Article structured data. The default image of the site is
+        not listed, as it does not represent any page in particular.
+        """
+        image = self.seo_image
+        default = self.seo_settings.og_image_default
+        if not image or (default and image.pk == default.pk):
+            return []
+        urls = [self.seo_image_url]
+        if len(self.seo_image_filters) > 1:
+            for url in utils.get_struct_data_images(self.seo_site, image):
+                if url not in urls:
+                    urls.append(url)
+        return urls
+
     @cached_property
     def seo_org_fields(self) -> SeoOrgFields:
         """
@@ -492,7 +1004,7 @@ class SeoMixin(SeoMetaFields, Page):
         pages, override this method to return ``self`` or some other
         class containing ``SeoOrgFields``
         """
-        return SeoSettings.for_site(site=self.get_site())
+        return self.seo_settings
 
     @property
     def seo_logo(self) -> Optional[AbstractImage]:
@@ -504,13 +1016,15 @@ class SeoMixin(SeoMetaFields, Page):
         return None
 
     @property
+    @timing.timed("seo_logo_url")
     def seo_logo_url(self) -> str:
         """
         Gets the absolute URL for the organization logo.
         """
-        if self.seo_logo:
-            url = self.seo_logo.get_rendition("original").url
-            base_url = utils.get_absolute_media_url(self.get_site())
+        logo = self.seo_logo
+        if logo:
+            url = renditions.get_rendition_url(logo, "original")
+            base_url = utils.get_absolute_media_url(self.seo_site)
             return utils.ensure_absolute_url(url, base_url)
         return ""
 
@@ -528,7 +1042,7 @@ class SeoMixin(SeoMetaFields, Page):
         Gets the site name.
         Override in your Page model as necessary.
         """
-        s = self.get_site()
+        s = self.seo_site
         if s:
             return s.site_name
         return ""
@@ -575,6 +1089,60 @@ class SeoMixin(SeoMetaFields, Page):
             return self.seo_org_fields.struct_org_name
         return self.seo_sitename
 
+    def _seo_org_cache_key(self, name: str) -> Optional[str]:
+        """
+        Gets the key under which organization data is shared between pages,
+        or ``None`` if it should not be cached.
+        """
+        if not self.live or getattr(self, "_seo_preview", False):
+            return None
+        site = self.seo_site
+        if site is None:
+            return None
+        org = self.seo_org_fields
+        if isinstance(org, Page):
+            # Org data comes from a page, so changes whenever it is edited.
+            org_key: tuple = (org.pk, org.latest_revision_id)
+        elif isinstance(org, SeoSettings):
+            org_key = (org.pk,)
+        else:
+            return None
+        return cache.make_key(
+            "org",
+            name,
+            self._meta.label,
+            org._meta.label,
+            *org_key,
+            cache.get_settings_version(site.pk, self.seo_request),
+        )
+
+    def _seo_cached_org_dict(
+        self, name: str, build: Callable[[], dict]
+    ) -> dict:
+        """
+        Gets an organization dictionary from ``build``, shared between all pages
+        with the same ``seo_org_fields`` when ``WAGTAILSEO_CACHE`` is enabled.
+        Only the page-specific ``url`` is filled in for each page.
+        """
+        backend = cache.get_cache()
+        if backend is None:
+            return build()
+        key = self._seo_org_cache_key(name)
+        if key is None:
+            return build()
+        url = self.seo_canonical_url
+        sd_dict = backend.get(key)
+        if sd_dict is None:
+            sd_dict = build()
+            shared = dict(sd_dict)
+            if shared.get("url") == url:
+                shared["url"] = ORG_URL_PLACEHOLDER
+            backend.set(key, shared)
+            return sd_dict
+        if sd_dict.get("url") == ORG_URL_PLACEHOLDER:
+            sd_dict["url"] = url
+        return sd_dict
+
     @property
     def seo_struct_org_base_dict(self) -> dict:
         """
@@ -583,7 +1151,11 @@ class SeoMixin(SeoMetaFields, Page):
 
         See: https://developers.google.com/search/docs/data-types/article
         """
+        return self._seo_cached_org_dict(
+            "base", self._build_seo_struct_org_base_dict
+        )
 
+    def _build_seo_struct_org_base_dict(self) -> dict:
         # Base info.
         sd_dict: dict = {
             "@context": "http://schema.org",
@@ -606,7 +1178,7 @@ class SeoMixin(SeoMetaFields, Page):
         # Image.
         if self.seo_org_fields.struct_org_image:
             images = utils.get_struct_data_images(
-                self.get_site(), self.seo_org_fields.struct_org_image
+                self.seo_site, self.seo_org_fields.struct_org_image
             )
             sd_dict.update({"image": images})
 
@@ -633,18 +1205,21 @@ class SeoMixin(SeoMetaFields, Page):
 
     @property
     def seo_struct_org_base_json(self) -> str:
-        return json.dumps(
-            self.seo_struct_org_base_dict, cls=utils.StructDataEncoder
-        )
+        return utils.dumps_struct_data(self.seo_struct_org_base_dict)
 
     @property
+    @timing.timed("seo_struct_org_dict")
     def seo_struct_org_dict(self) -> dict:
         """
         Gets full "Organization" structured data on top of base organization data.
 
         See: https://developers.google.com/search/docs/data-types/local-business
         """
+        return self._seo_cached_org_dict(
+            "full", self._build_seo_struct_org_dict
+        )
 
+    def _build_seo_struct_org_dict(self) -> dict:
         # Base info.
         sd_dict = self.seo_struct_org_base_dict
 
@@ -686,16 +1261,16 @@ class SeoMixin(SeoMetaFields, Page):
             sd_dict.update({"potentialAction": actions})
 
         # Extra JSON.
-        if self.seo_org_fields.struct_org_extra_json:
-            sd_dict.update(
-                json.loads(self.seo_org_fields.struct_org_extra_json)
-            )
+        sd_dict.update(self.seo_org_fields.struct_org_extra_dict)
 
         return sd_dict
 
     @property
     def seo_struct_org_json(self) -> str:
-        return json.dumps(self.seo_struct_org_dict, cls=utils.StructDataEncoder)
+        stored = self.seo_stored_meta
+        if stored is not None and stored.struct_org_json:
+            return stored.struct_org_json
+        return utils.dumps_struct_data(self.seo_struct_org_dict)
 
     @property
     def seo_struct_publisher_dict(self) -> Optional[dict]:
@@ -705,6 +1280,7 @@ class SeoMixin(SeoMetaFields, Page):
         return self.seo_struct_org_base_dict or None
 
     @property
+    @timing.timed("seo_struct_article_dict")
     def seo_struct_article_dict(self) -> dict:
         sd_dict = {
             "@context": "http://schema.org",
@@ -724,13 +1300,10 @@ class SeoMixin(SeoMetaFields, Page):
         }
 
         # Image, if available.
-        if self.seo_image:
+        image = self.seo_image
+        if image:
             sd_dict.update(
-                {
-                    "image": utils.get_struct_data_images(
-                        self.get_site(), self.seo_image
-                    )
-                }
+                {"image": utils.get_struct_data_images(self.seo_site, image)}
             )
 
         # Publisher, if available.
@@ -741,9 +1314,10 @@ class SeoMixin(SeoMetaFields, Page):
 
     @property
     def seo_struct_article_json(self) -> str:
-        return json.dumps(
-            self.seo_struct_article_dict, cls=utils.StructDataEncoder
-        )
+        stored = self.seo_stored_meta
+        if stored is not None and stored.struct_article_json:
+            return stored.struct_article_json
+        return utils.dumps_struct_data(self.seo_struct_article_dict)
 
     seo_meta_panels = [
         MultiFieldPanel(
@@ -768,3 +1342,93 @@ class SeoMixin(SeoMetaFields, Page):
     ]
 
     seo_panels = seo_meta_panels + seo_menu_panels
+
+
+def prefetch_seo_renditions(pages: Iterable[Page]) -> List[Page]:
+    """
+    Prefetches everything needed to render the SEO properties of many pages at
+    once, such as in listings, sitemaps, or APIs. The Site, ``SeoSettings``,
+    owner, and every image in ``seo_image_sources``, ``og_image_default``,
+    ``struct_org_logo`` and ``struct_org_image`` are loaded along with their
+    ``original`` and structured data renditions, using a fixed number of
+    queries regardless of the number of pages.
+
+    :param pages: Specific page instances. Pages without ``SeoMixin`` are
+        returned untouched.
+    :rtype: List[Page]
+    :returns: The pages, as a list.
+    """
+    pages = list(pages)
+    seo_pages = [p for p in pages if isinstance(p, SeoMixin)]
+    if not seo_pages:
+        return pages
+
+    # Sites, from the cached site root paths.
+    site_ids = {}
+    for page in seo_pages:
+        url_parts = page.get_url_parts()
+        site_ids[page.pk] = url_parts[0] if url_parts else None
+    sites = Site.objects.in_bulk({s for s in site_ids.values() if s})
+
+    # Settings of each site. Settings kept in this process already have their
+    # images and must not be modified.
+    settings_cached = cache.get_cache() is not None
+    if settings_cached:
+        seo_settings = {
+            site_id: SeoSettings.for_site(site)
+            for site_id, site in sites.items()
+        }
+    else:
+        seo_settings = {
+            s.site_id: s for s in SeoSettings.objects.filter(site_id__in=sites)
+        }
+        for site_id, site in sites.items():
+            if site_id not in seo_settings:
+                seo_settings[site_id] = SeoSettings.for_site(site)
+            seo_settings[site_id].site = site
+
+    # Owners, for the author.
+    owner_ids = {p.owner_id for p in seo_pages if p.owner_id}
+    owners = get_user_model().objects.in_bulk(owner_ids)
+
+    # Find every image referenced by the pages and settings.
+    image_model = get_image_model()
+    image_refs = []
+    for page in seo_pages:
+        for attr in page.seo_image_sources:
+            try:
+                field = page._meta.get_field(attr)
+            except FieldDoesNotExist:
+                continue
+            if field.is_relation and issubclass(
+                field.related_model, image_model
+            ):
+                image_refs.append((page, field))
+    if not settings_cached:
+        for obj in seo_settings.values():
+            for attr in SeoSettings.select_related:
+                image_refs.append((obj, obj._meta.get_field(attr)))
+    image_ids = {
+        getattr(obj, field.attname)
+        for obj, field in image_refs
+        if getattr(obj, field.attname)
+    }
+    images = image_model.objects.filter(pk__in=image_ids).prefetch_renditions(
+        *utils.SEO_RENDITION_FILTERS
+    )
+    images = {image.pk: image for image in images}
+
+    # Attach everything to the pages.
+    for obj, field in image_refs:
+        image_id = getattr(obj, field.attname)
+        if image_id in images:
+            setattr(obj, field.name, images[image_id])
+    for page in seo_pages:
+        site_id = site_ids[page.pk]
+        page.__dict__["seo_site"] = sites.get(site_id)
+        if site_id in seo_settings:
+            page.__dict__["seo_settings"] = seo_settings[site_id]
+        if page.owner_id in owners:
+            page.owner = owners[page.owner_id]
+
+    return pages
@@ -0,0 +1,233 @@
+"""
+Generates image renditions used by wagtail-seo in the background, so that
+requests never have to wait for an image to be resized.
+"""
+
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable
+from typing import Dict
+from typing import Iterable
+from typing import Optional
+from typing import Set
+from typing import Tuple
+
+from django.db import connections
+from django.db import transaction
+from wagtail.images.models import AbstractImage
+from wagtail.images.models import AbstractRendition
+from wagtail.images.models import Filter
+
+from wagtailseo import settings
+from wagtailseo.signals import seo_renditions_generated
+
+
+logger = logging.getLogger("wagtailseo")
+
+_executor: Optional[ThreadPoolExecutor] = None
+_lock = threading.Lock()
+_pending: Set[Tuple] = set()
+
+
+def is_enabled() -> bool:
+    """
+    Returns whether renditions are generated in the background, as configured
+    by ``WAGTAILSEO_RENDITION_WORKERS``.
+    """
+    return bool(settings.get("WAGTAILSEO_RENDITION_WORKERS"))
+
+
+def get_executor() -> ThreadPoolExecutor:
+    """
+    Returns the worker pool which generates renditions, and runs other
+    background work such as writing sitemaps.
+    """
+    global _executor
+    with _lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(
+                max_workers=settings.get("WAGTAILSEO_RENDITION_WORKERS") or 1,
+                thread_name_prefix="wagtailseo",
+            )
+        return _executor
+
+
+def get_renditions(
+    image: AbstractImage, filters: Iterable[str]
+) -> Dict[str, AbstractRendition]:
+    """
+    Returns renditions of ``image`` for each filter spec, generating any
+    which do not exist yet. Missing renditions are generated together, so that
+    the original image is only downloaded and decoded once. Renditions are
+    remembered on ``image`` for the rest of its lifetime.
+    """
+    filters = tuple(filters)
+    found = image.__dict__.setdefault("_wagtailseo_renditions", {})
+    missing = [spec for spec in filters if spec not in found]
+    if len(missing) > 1 and hasattr(image, "get_renditions"):
+        # Wagtail 5.2+ generates missing renditions from a single read of the
+        # original, in parallel.
+        found.update(image.get_renditions(*missing))
+    else:
+        for spec in missing:
+            found[spec] = image.get_rendition(spec)
+    return {spec: found[spec] for spec in filters}
+
+
+def find_existing_renditions(
+    image: AbstractImage, filters: Iterable[str]
+) -> Dict[str, AbstractRendition]:
+    """
+    Returns the renditions of ``image`` which already exist, out of each
+    filter spec, without generating any.
+    """
+    filters = tuple(filters)
+    found = image.__dict__.setdefault("_wagtailseo_renditions", {})
+    missing = [spec for spec in filters if spec not in found]
+    if missing and hasattr(image, "find_existing_renditions"):
+        existing = image.find_existing_renditions(
+            *[Filter(spec=spec) for spec in missing]
+        )
+        found.update({f.spec: rendition for f, rendition in existing.items()})
+    else:
+        for spec in missing:
+            try:
+                found[spec] = image.find_existing_rendition(Filter(spec=spec))
+            except image.get_rendition_model().DoesNotExist:
+                pass
+    return {spec: found[spec] for spec in filters if spec in found}
+
+
+async def aprefetch_renditions(
+    images: Iterable[AbstractImage], filters: Iterable[str]
+) -> None:
+    """
+    Remembers the renditions of each of ``images`` which already exist, out
+    of each filter spec, as ``find_existing_renditions()`` would, using a
+    single query of Django's async ORM.
+    """
+    filters = tuple(filters)
+    wanted = {}
+    for image in images:
+        found = image.__dict__.setdefault("_wagtailseo_renditions", {})
+        for spec in filters:
+            if spec not in found:
+                key = Filter(spec=spec).get_cache_key(image)
+                wanted[(image.pk, spec, key)] = image
+    if not wanted:
+        return
+    model = next(iter(wanted.values())).get_rendition_model()
+    queryset = model.objects.filter(
+        image_id__in={image_id for image_id, _, _ in wanted},
+        filter_spec__in=filters,
+    )
+    async for rendition in queryset:
+        key = (
+            rendition.image_id,
+            rendition.filter_spec,
+            rendition.focal_point_key,
+        )
+        image = wanted.get(key)
+        if image is not None:
+            rendition.image = image
+            image.__dict__["_wagtailseo_renditions"][rendition.filter_spec] = (
+                rendition
+            )
+
+
+def generate_renditions(image: AbstractImage, filters: Iterable[str]) -> None:
+    """
+    Generates renditions of ``image`` for each filter spec, if they do not
+    exist yet, then sends ``seo_renditions_generated``, as output rendered
+    in the meantime used the original image in their place.
+    """
+    get_renditions(image, filters)
+    seo_renditions_generated.send(sender=type(image), image=image)
+
+
+def _generate_in_background(key: Tuple) -> None:
+    model, pk, filters = key
+    try:
+        image = model.objects.get(pk=pk)
+        generate_renditions(image, filters)
+    except Exception:
+        logger.exception("Could not generate renditions of image %s", pk)
+    finally:
+        with _lock:
+            _pending.discard(key)
+        # Connections are per thread, and this thread is not a request.
+        connections.close_all()
+
+
+def pregenerate_renditions(image: AbstractImage, filters: Iterable[str]):
+    """
+    Schedules generation of renditions of ``image`` in the background, once
+    the current transaction is committed. Does nothing if background
+    generation is not enabled.
+    """
+    if not is_enabled():
+        return
+    key = (type(image), image.pk, tuple(filters))
+
+    def submit():
+        with _lock:
+            if key in _pending:
+                return
+            _pending.add(key)
+        get_executor().submit(_generate_in_background, key)
+
+    transaction.on_commit(submit)
+
+
+def _run_in_background(func: Callable, args: Tuple) -> None:
+    try:
+        func(*args)
+    except Exception:
+        logger.exception("Could not run %s in the background", func.__name__)
+    finally:
+        # Connections are per thread, and this thread is not a request.
+        connections.close_all()
+
+
+def run_in_background(func: Callable, *args) -> None:
+    """
+    Runs ``func(*args)`` in the background, once the current transaction is
+    committed.
+    """
+    transaction.on_commit(
+        lambda: get_executor().submit(_run_in_background, func, args)
+    )
+
+
+def get_rendition_urls(
+    image: AbstractImage, filters: Iterable[str]
+) -> Dict[str, str]:
+    """
+    Returns the URLs of renditions of ``image`` for each filter spec. When
+    renditions are generated in the background, those which do not exist yet
+    are scheduled and the URL of the original image is returned in the
+    meantime.
+    """
+    filters = tuple(filters)
+    if not is_enabled():
+        return {
+            spec: rendition.url
+            for spec, rendition in get_renditions(image, filters).items()
+        }
+    existing = find_existing_renditions(image, filters)
+    missing = [spec for spec in filters if spec not in existing]
+    if missing:
+        pregenerate_renditions(image, missing)
+    return {
+        spec: existing[spec].url if spec in existing else image.file.url
+        for spec in filters
+    }
+
+
+def get_rendition_url(image: AbstractImage, spec: str) -> str:
+    """
+    Returns the URL of a single rendition of ``image``, as with
+    ``get_rendition_urls()``.
+    """
+    return get_rendition_urls(image, [spec])[spec]
@@ -5,8 +5,28 @@ Provide default Django settings.
 from django.conf import settings
 
 
-# Title sitename separator. Default is em-dash.
-DEFAULTS = {"WAGTAILSEO_SEP": "—"}
+DEFAULTS = {
+    # Name of the Django cache used to cache rendered metadata, or None to
+    # disable caching.
+    "WAGTAILSEO_CACHE": None,
+    # Library used to serialize structured data: "orjson", "json", or "auto"
+    # to use orjson when it is installed.
+    "WAGTAILSEO_JSON_BACKEND": "auto",
+    # Title sitename separator. Default is em-dash.
+    "WAGTAILSEO_SEP": "—",
+    # Number of threads generating SEO image renditions in the background, or
+    # 0 to generate them during the request.
+    "WAGTAILSEO_RENDITION_WORKERS": 0,
+    # Store resolved SEO values of each page when it is published.
+    "WAGTAILSEO_STORE_META": False,
+    # Directory where gzipped sitemap shards are cached, or None to generate
+    # them on every request.
+    "WAGTAILSEO_SITEMAP_DIR": None,
+    # Maximum number of URLs in each sitemap shard.
+    "WAGTAILSEO_SITEMAP_SHARD_SIZE": 50000,
+    # Record the time and queries taken by SEO computations.
+    "WAGTAILSEO_TIMING": False,
+}
 
 
 def get(name: str):
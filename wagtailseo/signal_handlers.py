@@ -0,0 +1,407 @@
+"""
+Keeps stored SEO metadata in sync with pages, sites, and settings.
+"""
+
+import logging
+import threading
+import weakref
+from typing import Dict
+from typing import List
+from typing import Optional
+from typing import Set
+
+from django.core.exceptions import FieldDoesNotExist
+from django.db import transaction
+from django.db.models import Q
+from django.db.models.signals import post_delete
+from django.db.models.signals import post_save
+from django.db.models.signals import pre_delete
+from wagtail.images import get_image_model
+from wagtail.models import Page
+from wagtail.models import Site
+from wagtail.models import get_page_models
+from wagtail.signals import page_published
+from wagtail.signals import page_unpublished
+from wagtail.signals import post_page_move
+
+from wagtailseo import cache
+from wagtailseo import renditions
+from wagtailseo import settings
+from wagtailseo import sitemaps
+from wagtailseo import utils
+from wagtailseo.models import SeoMixin
+from wagtailseo.models import SeoPageMeta
+from wagtailseo.models import SeoSettings
+from wagtailseo.signals import seo_renditions_generated
+
+
+logger = logging.getLogger("wagtailseo")
+
+# Sitemap update queued in the current transaction of each thread, if any.
+_sitemap_update = threading.local()
+
+
+def get_page_seo_images(page: SeoMixin) -> list:
+    """
+    Gets the images whose renditions are used by the SEO values of ``page``.
+    """
+    org = page.seo_org_fields
+    images = (page.seo_image, page.seo_logo, org.struct_org_image)
+    return [image for image in images if image]
+
+
+def _store_page_meta(page: SeoMixin):
+    try:
+        SeoPageMeta.store(page)
+    except Exception:
+        # Never break publishing. The page will be rendered live instead.
+        logger.exception("Could not store SEO metadata for page %s", page.pk)
+        SeoPageMeta.objects.filter(page_id=page.pk).delete()
+
+
+def store_seo_meta_after_renditions(page_id: int):
+    """
+    Generates the renditions of the images of a page, then stores its SEO
+    values, so that they never refer to the original image in place of a
+    rendition which did not exist yet.
+    """
+    page = Page.objects.get(pk=page_id).specific
+    if not page.live or not isinstance(page, SeoMixin):
+        return
+    for image in get_page_seo_images(page):
+        renditions.generate_renditions(image, utils.SEO_RENDITION_FILTERS)
+    _store_page_meta(page)
+
+
+def store_seo_meta(sender, instance, **kwargs):
+    """
+    Stores the resolved SEO values of a page when it is published. When
+    renditions are generated in the background, the values are stored
+    in the background too, once the renditions exist.
+    """
+    if not settings.get("WAGTAILSEO_STORE_META"):
+        return
+    if not isinstance(instance, SeoMixin):
+        return
+    if renditions.is_enabled():
+        SeoPageMeta.objects.filter(page_id=instance.pk).delete()
+        renditions.run_in_background(
+            store_seo_meta_after_renditions, instance.pk
+        )
+        return
+    _store_page_meta(instance)
+
+
+def pregenerate_page_renditions(sender, instance, **kwargs):
+    """
+    Generates renditions of the images of a page in the background when it is
+    published. When SEO values are stored, that is done by
+    ``store_seo_meta()`` instead.
+    """
+    if not renditions.is_enabled() or not isinstance(instance, SeoMixin):
+        return
+    if settings.get("WAGTAILSEO_STORE_META"):
+        return
+    for image in get_page_seo_images(instance):
+        renditions.pregenerate_renditions(image, utils.SEO_RENDITION_FILTERS)
+
+
+def pregenerate_settings_renditions(sender, instance, **kwargs):
+    """
+    Generates renditions of the site-wide images in the background when
+    ``SeoSettings`` are saved.
+    """
+    if not renditions.is_enabled():
+        return
+    for image in (
+        instance.og_image_default,
+        instance.struct_org_logo,
+        instance.struct_org_image,
+    ):
+        if image:
+            renditions.pregenerate_renditions(
+                image, utils.SEO_RENDITION_FILTERS
+            )
+
+
+def get_image_page_lookups(image) -> list:
+    """
+    Gets each page model with ``SeoMixin`` which can use ``image`` in its
+    ``seo_image_sources``, along with lookups matching pages which do.
+    """
+    result = []
+    for model in get_page_models():
+        if not issubclass(model, SeoMixin):
+            continue
+        lookups = Q()
+        for attr in model.seo_image_sources:
+            try:
+                field = model._meta.get_field(attr)
+            except FieldDoesNotExist:
+                continue
+            if field.is_relation and isinstance(image, field.related_model):
+                lookups |= Q(**{attr: image})
+        if lookups:
+            result.append((model, lookups))
+    return result
+
+
+def is_seo_image(image) -> bool:
+    """
+    Returns whether ``image`` is used by ``SeoSettings`` or by the
+    ``seo_image_sources`` of any page.
+    """
+    if SeoSettings.objects.filter(
+        Q(og_image_default=image)
+        | Q(struct_org_logo=image)
+        | Q(struct_org_image=image)
+    ).exists():
+        return True
+    for model, lookups in get_image_page_lookups(image):
+        if model.objects.filter(lookups).exists():
+            return True
+    return False
+
+
+def pregenerate_image_renditions(sender, instance, created, **kwargs):
+    """
+    Generates renditions in the background when an image used for SEO is
+    changed.
+    """
+    if created or not renditions.is_enabled():
+        return
+    if is_seo_image(instance):
+        renditions.pregenerate_renditions(instance, utils.SEO_RENDITION_FILTERS)
+
+
+def invalidate_image_cache(image):
+    """
+    Invalidates cached metadata of pages using ``image``, and everything cached
+    for sites whose ``SeoSettings`` use it.
+    """
+    if cache.get_cache() is None:
+        return
+    site_ids = SeoSettings.objects.filter(
+        Q(og_image_default=image)
+        | Q(struct_org_logo=image)
+        | Q(struct_org_image=image)
+    ).values_list("site_id", flat=True)
+    for site_id in site_ids:
+        cache.bump_settings_version(site_id)
+    for model, lookups in get_image_page_lookups(image):
+        cache.bump_page_versions(
+            model.objects.filter(lookups).values_list("pk", flat=True)
+        )
+
+
+def image_changed(sender, instance, **kwargs):
+    """
+    Invalidates cached metadata using an image when it is changed or deleted,
+    as the URLs of its renditions change.
+    """
+    if kwargs.get("created"):
+        return
+    invalidate_image_cache(instance)
+
+
+def renditions_generated(sender, image, **kwargs):
+    """
+    Invalidates cached metadata using an image once its renditions have been
+    generated in the background, as it was built with the URL of the original
+    image in their place.
+    """
+    invalidate_image_cache(image)
+
+
+def delete_image_seo_meta(sender, instance, **kwargs):
+    """
+    Deletes the stored SEO values of pages using an image, directly or
+    through the ``SeoSettings`` of their site, when it is changed or deleted,
+    as the URLs of its renditions change.
+    """
+    if kwargs.get("created") or not settings.get("WAGTAILSEO_STORE_META"):
+        return
+    for model, lookups in get_image_page_lookups(instance):
+        SeoPageMeta.objects.filter(
+            page_id__in=model.objects.filter(lookups).values("pk")
+        ).delete()
+    sites = Site.objects.filter(
+        pk__in=SeoSettings.objects.filter(
+            Q(og_image_default=instance)
+            | Q(struct_org_logo=instance)
+            | Q(struct_org_image=instance)
+        ).values("site_id")
+    ).select_related("root_page")
+    for site in sites:
+        delete_site_seo_meta(site)
+
+
+def delete_seo_meta(sender, instance, **kwargs):
+    """
+    Deletes the stored SEO values of a page when it is unpublished.
+    """
+    SeoPageMeta.objects.filter(page_id=instance.pk).delete()
+
+
+def delete_moved_seo_meta(sender, instance, **kwargs):
+    """
+    URLs of a moved page and its descendants change, so stored values of the
+    whole subtree are out of date.
+    """
+    if kwargs.get("url_path_before") == kwargs.get("url_path_after"):
+        return
+    SeoPageMeta.objects.filter(page__path__startswith=instance.path).delete()
+
+
+def delete_site_seo_meta(site: Site):
+    """
+    Deletes the stored SEO values of every page in ``site``.
+    """
+    SeoPageMeta.objects.filter(
+        page__path__startswith=site.root_page.path
+    ).delete()
+
+
+class SitemapUpdate:
+    """
+    Pages changed in a transaction, by site ID, whose cached sitemap shards
+    are written again in the background once it is committed. Sites are
+    loaded once per transaction.
+    """
+
+    def __init__(self):
+        self.pages: Dict[int, Set[int]] = {}
+        self.sites = list(Site.objects.select_related("root_page"))
+        self.done = False
+
+    def add(self, page_ids: List[int], paths: List[str]):
+        for site in self.sites:
+            if any(p.startswith(site.root_page.path) for p in paths):
+                self.pages.setdefault(site.pk, set()).update(page_ids)
+
+    def __call__(self):
+        self.done = True
+        _sitemap_update.__dict__.pop("ref", None)
+        sites = {site.pk: site for site in self.sites}
+        for site_id, page_ids in self.pages.items():
+            renditions.run_in_background(
+                sitemaps.update_pages, sites[site_id], page_ids
+            )
+
+
+def get_sitemap_update() -> Optional[SitemapUpdate]:
+    """
+    Gets the sitemap update queued in the current transaction, if any.
+    """
+    ref = getattr(_sitemap_update, "ref", None)
+    update = ref() if ref is not None else None
+    if update is None or update.done:
+        return None
+    # Only ``on_commit()`` holds the update, so it is gone once the
+    # transaction is rolled back. Outside of a transaction, any update left
+    # was never committed.
+    if not transaction.get_connection().in_atomic_block:
+        return None
+    return update
+
+
+def update_page_sitemaps(sender, instance, **kwargs):
+    """
+    Writes again the cached sitemap shards containing a page, and its
+    descendants if moved, when it is published, unpublished, moved, or deleted.
+    Shards are written in the background once the current transaction is
+    committed.
+    """
+    if not settings.get("WAGTAILSEO_SITEMAP_DIR"):
+        return
+    if not isinstance(instance, Page):
+        return
+    page_ids = [instance.pk]
+    paths = [instance.path]
+    parent_before = kwargs.get("parent_page_before")
+    if parent_before is not None:
+        paths.append(parent_before.path)
+    if "url_path_after" in kwargs:
+        page_ids = list(
+            Page.objects.filter(path__startswith=instance.path).values_list(
+                "pk", flat=True
+            )
+        )
+
+    queue_sitemap_pages(page_ids, paths)
+
+
+def update_image_sitemaps(sender, instance, created, **kwargs):
+    """
+    Writes again the cached sitemap shards listing an image when it is
+    changed, as the URLs of its renditions may have changed.
+    """
+    if created or not settings.get("WAGTAILSEO_SITEMAP_DIR"):
+        return
+    page_lookups = get_image_page_lookups(instance)
+    for site in Site.objects.select_related("root_page"):
+        root_path = site.root_page.path
+        for model, lookups in page_lookups:
+            page_ids = list(
+                model.objects.filter(
+                    lookups, path__startswith=root_path
+                ).values_list("pk", flat=True)
+            )
+            if page_ids:
+                queue_sitemap_pages(page_ids, [root_path])
+
+
+def queue_sitemap_pages(page_ids: List[int], paths: List[str]):
+    """
+    Schedules the cached sitemap shards containing ``page_ids`` to be written
+    again in the background, in each site containing any of ``paths``, once
+    the current transaction is committed.
+    """
+    update = get_sitemap_update()
+    if update is not None:
+        update.add(page_ids, paths)
+        return
+    update = SitemapUpdate()
+    update.add(page_ids, paths)
+    _sitemap_update.ref = weakref.ref(update)
+    transaction.on_commit(update)
+
+
+def settings_changed(sender, instance, **kwargs):
+    """
+    Invalidates cached and stored metadata of a site when its ``SeoSettings``
+    are saved.
+    """
+    cache.bump_settings_version(instance.site_id)
+    delete_site_seo_meta(instance.site)
+
+
+def site_changed(sender, instance, **kwargs):
+    """
+    Invalidates cached and stored metadata of a site when it is saved, as the
+    site name and root URL are part of the metadata.
+    """
+    cache.bump_settings_version(instance.pk)
+    delete_site_seo_meta(instance)
+    sitemaps.clear_site(instance.pk)
+
+
+def register_signal_handlers():
+    page_published.connect(store_seo_meta)
+    page_published.connect(pregenerate_page_renditions)
+    page_unpublished.connect(delete_seo_meta)
+    post_page_move.connect(delete_moved_seo_meta)
+    page_published.connect(update_page_sitemaps)
+    page_unpublished.connect(update_page_sitemaps)
+    post_page_move.connect(update_page_sitemaps)
+    post_delete.connect(update_page_sitemaps)
+    post_save.connect(settings_changed, sender=SeoSettings)
+    post_save.connect(pregenerate_settings_renditions, sender=SeoSettings)
+    post_save.connect(pregenerate_image_renditions, sender=get_image_model())
+    post_save.connect(image_changed, sender=get_image_model())
+    post_save.connect(update_image_sitemaps, sender=get_image_model())
+    pre_delete.connect(image_changed, sender=get_image_model())
+    seo_renditions_generated.connect(renditions_generated)
+    post_save.connect(delete_image_seo_meta, sender=get_image_model())
+    pre_delete.connect(delete_image_seo_meta, sender=get_image_model())
+    post_save.connect(site_changed, sender=Site)
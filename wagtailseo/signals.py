@@ -0,0 +1,11 @@
+from django.dispatch import Signal
+
+
+# Sent each time an SEO computation is timed, when ``WAGTAILSEO_TIMING`` is
+# enabled. Receives ``name``, ``duration`` in seconds, the number of
+# ``queries``, and the ``request`` being served, or None.
+seo_timing = Signal()
+
+# Sent once renditions of an image have been generated in the background, see
+# ``WAGTAILSEO_RENDITION_WORKERS``. Receives the ``image``.
+seo_renditions_generated = Signal()
@@ -0,0 +1,435 @@
+"""
+Sitemaps of the canonical URLs of ``SeoMixin`` pages, with their images.
+
+Pages of a site are split into shards by ID, each listing at most
+``WAGTAILSEO_SITEMAP_SHARD_SIZE`` URLs, which are listed in a sitemap index.
+Shards are streamed as they are generated. When ``WAGTAILSEO_SITEMAP_DIR`` is
+set, shards are also written there gzipped, and served from disk. When a page
+changes, only the shards containing it are written again.
+"""
+
+import bisect
+import gzip
+import json
+import os
+import shutil
+import uuid
+import zlib
+from datetime import datetime
+from datetime import timezone
+from typing import Iterable
+from typing import Iterator
+from typing import List
+from typing import Optional
+from xml.sax.saxutils import escape
+
+from django.db.models import QuerySet
+from django.http import Http404
+from django.http import HttpRequest
+from django.http import HttpResponse
+from django.http import StreamingHttpResponse
+from django.urls import reverse
+from django.utils.cache import patch_vary_headers
+from django.views.decorators.http import condition
+from wagtail.models import Page
+from wagtail.models import Site
+
+from wagtailseo import audit
+from wagtailseo import settings
+from wagtailseo.models import prefetch_seo_renditions
+
+
+# Number of pages loaded from the database at a time.
+BATCH_SIZE = 500
+
+XML_HEADER = '<?xml version="1.0" encoding="UTF-8"?>\n'
+
+
+# -- Generation ---------------------------------------------------------------
+
+
+def get_sitemap_pages(site: Site) -> QuerySet:
+    """
+    Gets every page listed in the sitemap of ``site``.
+    """
+    return (
+        audit.get_seo_pages()
+        .live()
+        .public()
+        .descendant_of(site.root_page, inclusive=True)
+    )
+
+
+def get_shard_bounds(site: Site, start: Optional[int] = None) -> List[int]:
+    """
+    Splits the pages of ``site`` into shards.
+
+    :param start: Only split pages from this ID onwards.
+    :rtype: List[int]
+    :returns: The ID of the first page of each shard. Each shard includes pages
+        up to the first page of the next one.
+    """
+    size = settings.get("WAGTAILSEO_SITEMAP_SHARD_SIZE")
+    ids = get_sitemap_pages(site).order_by("pk").values_list("pk", flat=True)
+    if start is not None:
+        ids = ids.filter(pk__gte=start)
+    first = ids.first()
+    if first is None:
+        return []
+    bounds = [first]
+    while True:
+        try:
+            bounds.append(ids.filter(pk__gte=bounds[-1])[size])
+        except IndexError:
+            return bounds
+
+
+def get_shard_index(bounds: List[int], page_id: int) -> int:
+    """
+    Gets the shard containing a page, out of ``bounds``.
+    """
+    return max(bisect.bisect_right(bounds, page_id) - 1, 0)
+
+
+def get_shard_pages(site: Site, bounds: List[int], shard: int) -> QuerySet:
+    """
+    Gets the pages in a shard of the sitemap of ``site``. The first and last
+    shards also include any pages before or after the bounds.
+    """
+    pages = get_sitemap_pages(site)
+    if shard > 0:
+        pages = pages.filter(pk__gte=bounds[shard])
+    if shard + 1 < len(bounds):
+        pages = pages.filter(pk__lt=bounds[shard + 1])
+    return pages
+
+
+def iter_pages(pages: QuerySet) -> Iterator[Page]:
+    """
+    Iterates over specific pages in order, loading them in batches, along with
+    their images and renditions, to keep memory use and queries bounded.
+    """
+    pages = pages.order_by("pk")
+    last = None
+    while True:
+        batch = pages if last is None else pages.filter(pk__gt=last)
+        batch = prefetch_seo_renditions(batch[:BATCH_SIZE].specific())
+        if not batch:
+            return
+        yield from batch
+        last = batch[-1].pk
+
+
+def get_url_xml(page) -> str:
+    """
+    Gets the ``<url>`` entry of a page, with an ``<image:image>`` entry for
+    each of its images, or an empty string if the page should not be listed
+    because its canonical URL points elsewhere.
+    """
+    url = page.seo_canonical_url
+    if url != page.get_full_url():
+        return ""
+    xml = "<url><loc>{0}</loc>".format(escape(url))
+    if page.last_published_at:
+        xml += "<lastmod>{0}</lastmod>".format(
+            page.last_published_at.isoformat()
+        )
+    for image_url in page.seo_sitemap_image_urls:
+        xml += "<image:image><image:loc>{0}</image:loc></image:image>".format(
+            escape(image_url)
+        )
+    return xml + "</url>\n"
+
+
+def iter_shard_xml(pages: QuerySet) -> Iterator[bytes]:
+    """
+    Generates the XML of a sitemap shard, one batch of pages at a time.
+    """
+    yield (
+        XML_HEADER
+        + '<urlset xmlns="http://www.sitemaps.org/schemas/sitemap/0.9" '
+        + 'xmlns:image="http://www.google.com/schemas/sitemap-image/1.1">\n'
+    ).encode("utf8")
+    chunk = []
+    for page in iter_pages(pages):
+        chunk.append(get_url_xml(page))
+        if len(chunk) >= BATCH_SIZE:
+            yield "".join(chunk).encode("utf8")
+            chunk = []
+    chunk.append("</urlset>\n")
+    yield "".join(chunk).encode("utf8")
+
+
+def get_index_xml(
+    request: HttpRequest,
+    num_shards: int,
+    lastmods: Optional[List[Optional[datetime]]] = None,
+) -> str:
+    """
+    Gets the XML of a sitemap index listing ``num_shards`` shards, with the
+    time each was last modified, if known.
+    """
+    xml = [
+        XML_HEADER,
+        '<sitemapindex xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">\n',
+    ]
+    for shard in range(num_shards):
+        url = request.build_absolute_uri(
+            reverse("wagtailseo_sitemap_shard", args=[shard])
+        )
+        xml.append("<sitemap><loc>{0}</loc>".format(escape(url)))
+        lastmod = lastmods[shard] if lastmods else None
+        if lastmod:
+            xml.append("<lastmod>{0}</lastmod>".format(lastmod.isoformat()))
+        xml.append("</sitemap>\n")
+    xml.append("</sitemapindex>\n")
+    return "".join(xml)
+
+
+# -- Storage ------------------------------------------------------------------
+
+
+def get_site_dir(site_id: int) -> Optional[str]:
+    """
+    Gets the directory where the sitemap of a site is cached, or None if
+    sitemaps are not cached.
+    """
+    base = settings.get("WAGTAILSEO_SITEMAP_DIR")
+    if not base:
+        return None
+    return os.path.join(base, str(site_id))
+
+
+def get_shard_path(site_dir: str, shard: int) -> str:
+    return os.path.join(site_dir, "sitemap-{0}.xml.gz".format(shard))
+
+
+def write_atomic(path: str, chunks) -> None:
+    """
+    Writes ``chunks`` to a temporary file, then moves it to ``path``, so that
+    readers never see a partially written file.
+    """
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp = "{0}.{1}.tmp".format(path, uuid.uuid4().hex)
+    try:
+        with open(tmp, "wb") as f:
+            for chunk in chunks:
+                f.write(chunk)
+        os.replace(tmp, path)
+    except BaseException:
+        if os.path.exists(tmp):
+            os.remove(tmp)
+        raise
+
+
+def iter_gzip(chunks: Iterator[bytes]) -> Iterator[bytes]:
+    """
+    Compresses ``chunks`` in gzip format.
+    """
+    compressor = zlib.compressobj(wbits=zlib.MAX_WBITS | 16)
+    for chunk in chunks:
+        data = compressor.compress(chunk)
+        if data:
+            yield data
+    yield compressor.flush()
+
+
+class FileChunks:
+    """
+    Reads a file in chunks, for ``StreamingHttpResponse``, which closes it
+    once the response is closed, even if it was never read, such as for a
+    HEAD request or an aborted response.
+    """
+
+    def __init__(self, f, chunk_size: int = 64 * 1024):
+        self.f = f
+        self.chunk_size = chunk_size
+
+    def __iter__(self) -> Iterator[bytes]:
+        while True:
+            chunk = self.f.read(self.chunk_size)
+            if not chunk:
+                return
+            yield chunk
+
+    def close(self):
+        self.f.close()
+
+
+def get_manifest_path(site_dir: str) -> str:
+    return os.path.join(site_dir, "manifest.json")
+
+
+def read_bounds(site_dir: str) -> Optional[List[int]]:
+    """
+    Reads the shard bounds of a cached sitemap, or None if it is not cached.
+    """
+    try:
+        with open(get_manifest_path(site_dir), encoding="utf8") as f:
+            return json.load(f)["bounds"]
+    except (OSError, ValueError, KeyError):
+        return None
+
+
+def write_bounds(site_dir: str, bounds: List[int]) -> None:
+    write_atomic(
+        get_manifest_path(site_dir),
+        [json.dumps({"bounds": bounds}).encode("utf8")],
+    )
+
+
+def get_bounds(site: Site) -> List[int]:
+    """
+    Gets the shard bounds of a site, from the cached manifest if possible.
+    """
+    site_dir = get_site_dir(site.pk)
+    if site_dir is None:
+        return get_shard_bounds(site)
+    bounds = read_bounds(site_dir)
+    if bounds is None:
+        bounds = get_shard_bounds(site)
+        write_bounds(site_dir, bounds)
+    return bounds
+
+
+def write_shard(site: Site, bounds: List[int], shard: int) -> str:
+    """
+    Writes a shard to the cache, replacing it atomically.
+    """
+    site_dir = get_site_dir(site.pk)
+    assert site_dir is not None
+    path = get_shard_path(site_dir, shard)
+    pages = get_shard_pages(site, bounds, shard)
+    write_atomic(path, iter_gzip(iter_shard_xml(pages)))
+    return path
+
+
+def get_shard_file(site: Site, bounds: List[int], shard: int) -> str:
+    """
+    Gets the path of a cached shard, writing it first if needed.
+    """
+    site_dir = get_site_dir(site.pk)
+    assert site_dir is not None
+    path = get_shard_path(site_dir, shard)
+    if not os.path.exists(path):
+        write_shard(site, bounds, shard)
+    return path
+
+
+def get_shard_mtime(path: str) -> Optional[datetime]:
+    try:
+        return datetime.fromtimestamp(os.path.getmtime(path), tz=timezone.utc)
+    except OSError:
+        return None
+
+
+def update_pages(site: Site, page_ids: Iterable[int]) -> None:
+    """
+    Writes again the cached shards of ``site`` which contain any of
+    ``page_ids``, leaving every other shard as is. Shards which have not been
+    written yet are left to be written when first requested.
+    """
+    site_dir = get_site_dir(site.pk)
+    if site_dir is None:
+        return
+    bounds = read_bounds(site_dir)
+    if bounds is None:
+        return
+    if not bounds:
+        # The site had no pages. Work out the shards again.
+        clear_site(site.pk)
+        return
+
+    size = settings.get("WAGTAILSEO_SITEMAP_SHARD_SIZE")
+    last = len(bounds) - 1
+    for shard in sorted({get_shard_index(bounds, pk) for pk in page_ids}):
+        if shard == last:
+            # New pages are added to the last shard, which is split once full.
+            tail = get_shard_bounds(site, start=bounds[last] if last else None)
+            if len(tail) > 1:
+                bounds = bounds[:last] + tail
+                write_bounds(site_dir, bounds)
+        elif get_shard_pages(site, bounds, shard).count() > size:
+            # Pages moved in from another site overfilled the shard.
+            clear_site(site.pk)
+            return
+        if os.path.exists(get_shard_path(site_dir, shard)):
+            write_shard(site, bounds, shard)
+
+
+def clear_site(site_id: int) -> None:
+    """
+    Deletes the cached sitemap of a site, which is written again when next
+    requested.
+    """
+    site_dir = get_site_dir(site_id)
+    if site_dir is not None:
+        shutil.rmtree(site_dir, ignore_errors=True)
+
+
+# -- Views --------------------------------------------------------------------
+
+
+def _get_site(request: HttpRequest) -> Site:
+    site = Site.find_for_request(request)
+    if site is None:
+        raise Http404
+    return site
+
+
+def sitemap_index(request: HttpRequest) -> HttpResponse:
+    """
+    Lists the sitemap shards of the current site.
+    """
+    site = _get_site(request)
+    bounds = get_bounds(site)
+    site_dir = get_site_dir(site.pk)
+    lastmods = None
+    if site_dir is not None:
+        lastmods = [
+            get_shard_mtime(get_shard_path(site_dir, shard))
+            for shard in range(len(bounds))
+        ]
+    return HttpResponse(
+        get_index_xml(request, len(bounds), lastmods),
+        content_type="application/xml",
+    )
+
+
+def _shard_last_modified(request, shard: int) -> Optional[datetime]:
+    site = _get_site(request)
+    bounds = get_bounds(site)
+    if not 0 <= shard < len(bounds):
+        raise Http404
+    request._wagtailseo_sitemap = (site, bounds)
+    # Only cached shards have a date which changes when pages are removed.
+    if get_site_dir(site.pk) is None:
+        return None
+    return get_shard_mtime(get_shard_file(site, bounds, shard))
+
+
+@condition(last_modified_func=_shard_last_modified)
+def sitemap_shard(request: HttpRequest, shard: int) -> HttpResponse:
+    """
+    Streams a sitemap shard of the current site.
+    """
+    site, bounds = request._wagtailseo_sitemap
+    if get_site_dir(site.pk) is None:
+        return StreamingHttpResponse(
+            iter_shard_xml(get_shard_pages(site, bounds, shard)),
+            content_type="application/xml",
+        )
+
+    path = get_shard_file(site, bounds, shard)
+    if "gzip" in request.META.get("HTTP_ACCEPT_ENCODING", ""):
+        response = StreamingHttpResponse(
+            FileChunks(open(path, "rb")), content_type="application/xml"
+        )
+        response["Content-Encoding"] = "gzip"
+        response["Content-Length"] = os.path.getsize(path)
+    else:
+        response = StreamingHttpResponse(
+            FileChunks(gzip.open(path, "rb")), content_type="application/xml"
+        )
+    patch_vary_headers(response, ["Accept-Encoding"])
+    return response
@@ -0,0 +1,80 @@
+import os
+
+from django import template
+
+from wagtailseo import cache
+from wagtailseo import meta
+from wagtailseo import timing
+
+
+register = template.Library()
+
+
+class SeoCacheNode(template.Node):
+    """
+    Caches the rendered contents of the current page's metadata, when
+    ``WAGTAILSEO_CACHE`` is enabled, and times them when ``WAGTAILSEO_TIMING``
+    is enabled.
+    """
+
+    def __init__(self, nodelist):
+        self.nodelist = nodelist
+
+    def get_cache_key(self, context):
+        page = context.get("self")
+        if not hasattr(page, "seo_meta") or not page.live:
+            return None
+        request = context.get("request")
+        if getattr(request, "is_preview", False):
+            return None
+        # Templates extending meta.html render in the context of the
+        # outermost template, and may vary with the URL.
+        template = context.template or context.render_context.template
+        if template.name is None:
+            return None
+        return cache.get_meta_cache_key(
+            page, template.name, getattr(request, "path", "")
+        )
+
+    def render(self, context):
+        if not timing.is_enabled():
+            return self.render_cached(context)
+        name = os.path.basename(context.render_context.template.name)
+        with timing.measure(name):
+            return self.render_cached(context)
+
+    def render_cached(self, context):
+        backend = cache.get_cache()
+        if backend is None:
+            return self.nodelist.render(context)
+        key = self.get_cache_key(context)
+        if key is None:
+            return self.nodelist.render(context)
+        html = backend.get(key)
+        if html is None:
+            html = self.nodelist.render(context)
+            backend.set(key, html)
+        return html
+
+
+@register.tag
+def seo_cache(parser, token):
+    """
+    Caches its contents per page revision and site settings version::
+
+        {% seo_cache %}...{% endseo_cache %}
+    """
+    nodelist = parser.parse(("endseo_cache",))
+    parser.delete_first_token()
+    return SeoCacheNode(nodelist)
+
+
+@register.simple_tag(takes_context=True)
+def seo_meta(context):
+    """
+    Renders the same metadata as ``wagtailseo/meta.html`` for the current
+    page, without the template engine::
+
+        {% seo_meta %}
+    """
+    return meta.render_seo_meta(context.get("self"), context.get("request"))
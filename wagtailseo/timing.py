@@ -0,0 +1,137 @@
+"""
+Records the time and queries taken by SEO computations, when
+``WAGTAILSEO_TIMING`` is enabled. Each measurement is sent with the
+``seo_timing`` signal, and added up per request, for ``SeoRequestMiddleware``
+to report in a ``Server-Timing`` header.
+"""
+
+import functools
+import time
+from contextlib import contextmanager
+from typing import Dict
+from typing import Iterator
+from typing import List
+from typing import Optional
+
+from django.db import connection
+from django.http import HttpRequest
+
+from wagtailseo import settings
+from wagtailseo.signals import seo_timing
+
+
+class QueryCounter:
+    """
+    Counts queries run on a connection, see ``connection.execute_wrapper()``.
+    """
+
+    def __init__(self):
+        self.count = 0
+
+    def __call__(self, execute, sql, params, many, context):
+        self.count += 1
+        return execute(sql, params, many, context)
+
+
+class Timing:
+    """
+    Total time and queries taken by every call of one computation.
+    """
+
+    __slots__ = ("name", "calls", "duration", "queries")
+
+    def __init__(self, name: str):
+        self.name = name
+        self.calls = 0
+        self.duration = 0.0
+        self.queries = 0
+
+
+def is_enabled() -> bool:
+    return bool(settings.get("WAGTAILSEO_TIMING"))
+
+
+def _get_request() -> Optional[HttpRequest]:
+    from wagtailseo import utils
+
+    return utils.get_current_request()
+
+
+def get_timings(request: HttpRequest) -> List[Timing]:
+    """
+    Gets the timings recorded while serving ``request``, in the order they
+    were first recorded.
+    """
+    timings: Dict[str, Timing] = request.__dict__.get("_wagtailseo_timings", {})
+    return list(timings.values())
+
+
+def record(name: str, duration: float, queries: int) -> None:
+    """
+    Records one call of a computation, see ``measure()``.
+    """
+    request = _get_request()
+    if request is not None:
+        timings = request.__dict__.setdefault("_wagtailseo_timings", {})
+        if name not in timings:
+            timings[name] = Timing(name)
+        timing = timings[name]
+        timing.calls += 1
+        timing.duration += duration
+        timing.queries += queries
+    seo_timing.send(
+        sender=None,
+        name=name,
+        duration=duration,
+        queries=queries,
+        request=request,
+    )
+
+
+@contextmanager
+def measure(name: str) -> Iterator[None]:
+    """
+    Records the time and queries taken by the enclosed code. Measurements
+    nest, so the time of a computation includes that of any it calls.
+    """
+    if not is_enabled():
+        yield
+        return
+    counter = QueryCounter()
+    start = time.perf_counter()
+    try:
+        with connection.execute_wrapper(counter):
+            yield
+    finally:
+        record(name, time.perf_counter() - start, counter.count)
+
+
+def timed(name: str):
+    """
+    Decorates a function, or the getter of a property, to be measured as
+    ``name``.
+    """
+
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if not is_enabled():
+                return func(*args, **kwargs)
+            with measure(name):
+                return func(*args, **kwargs)
+
+        return wrapper
+
+    return decorator
+
+
+def get_server_timing(timings: List[Timing]) -> str:
+    """
+    Formats timings as the value of a ``Server-Timing`` header.
+    """
+    return ", ".join(
+        '{0};dur={1:.2f};desc="{2} calls, {3} queries"'.format(
+            t.name, t.duration * 1000, t.calls, t.queries
+        )
+        for t in timings
+    )
@@ -0,0 +1,17 @@
+"""
+Sitemap URLs. Include these before Wagtail's own URLs.
+"""
+
+from django.urls import path
+
+from wagtailseo import sitemaps
+
+
+urlpatterns = [
+    path("sitemap.xml", sitemaps.sitemap_index, name="wagtailseo_sitemap"),
+    path(
+        "sitemap-<int:shard>.xml",
+        sitemaps.sitemap_shard,
+        name="wagtailseo_sitemap_shard",
+    ),
+]
@@ -1,21 +1,62 @@
+import codecs
+import functools
+import logging
 import re
+from contextvars import ContextVar
 from datetime import date
 from datetime import datetime
 from datetime import time
+from html.parser import HTMLParser
 from json import JSONEncoder
+from json import loads
+from typing import Dict
 from typing import List
 from typing import Optional
 from typing import Union
 
 from django.conf import settings
+from django.core.exceptions import ImproperlyConfigured
+from django.core.exceptions import ValidationError
+from django.http import HttpRequest
+from django.http import HttpResponseBase
+from django.utils.translation import gettext_lazy as _
 from wagtail.images.models import AbstractImage
 from wagtail.models import Site
 
+from wagtailseo import renditions
+from wagtailseo import settings as seo_settings
+from wagtailseo import timing
+
+
+try:
+    import orjson
+except ImportError:
+    orjson = None  # type: ignore[assignment]
+
+
+logger = logging.getLogger("wagtailseo")
 
 # Matches a protocol, such as https://
 PROTOCOL_RE = re.compile(r"^(\w[\w\.\-\+]*:)*//")
 MEDIA_IS_ABSOLUTE = PROTOCOL_RE.match(settings.MEDIA_URL)
 
+# The request currently being served, set by ``SeoRequestMiddleware``.
+current_request: ContextVar[Optional[HttpRequest]] = ContextVar(
+    "wagtailseo_current_request", default=None
+)
+
+# Renditions required for structured data images, in 1:1, 4:3, and 16:9 aspect
+# ratios. Use huge numbers because Wagtail will not upscale, but will max out at
+# the image's original resolution using the specified aspect ratio.
+STRUCT_DATA_FILTERS = (
+    "fill-10000x10000",
+    "fill-40000x30000",
+    "fill-16000x9000",
+)
+
+# Every rendition used by wagtail-seo.
+SEO_RENDITION_FILTERS = ("original",) + STRUCT_DATA_FILTERS
+
 
 def serialize_date(date: Union[date, datetime, time]) -> str:
     """
@@ -29,6 +70,17 @@ def serialize_date(date: Union[date, datetime, time]) -> str:
     return date.isoformat()
 
 
+def get_current_request() -> Optional[HttpRequest]:
+    """
+    Returns the request currently being served, if ``SeoRequestMiddleware``
+    is installed.
+
+    :rtype: Optional[HttpRequest]
+    :returns: The current request, or None.
+    """
+    return current_request.get()
+
+
 def get_absolute_media_url(site: Optional[Site]) -> str:
     """
     Returns an absolute base URL for media files.
@@ -53,6 +105,7 @@ def ensure_absolute_url(url: str, base_url: str) -> str:
     return url
 
 
+@timing.timed("get_struct_data_images")
 def get_struct_data_images(site: Site, image: AbstractImage) -> List[str]:
     """
     Google requires multiple different aspect ratios for certain structured
@@ -66,21 +119,88 @@ def get_struct_data_images(site: Site, image: AbstractImage) -> List[str]:
     """
 
     base_url = get_absolute_media_url(site)
+    urls = renditions.get_rendition_urls(image, STRUCT_DATA_FILTERS)
+    return [ensure_absolute_url(url, base_url) for url in urls.values()]
 
-    # Use huge numbers because Wagtail will not upscale, but will max out at the
-    # image's original resolution using the specified aspect ratio.
-    # Google wants them high resolution.
-    img1x1 = ensure_absolute_url(
-        image.get_rendition("fill-10000x10000").url, base_url
-    )
-    img4x3 = ensure_absolute_url(
-        image.get_rendition("fill-40000x30000").url, base_url
-    )
-    img16x9 = ensure_absolute_url(
-        image.get_rendition("fill-16000x9000").url, base_url
-    )
 
-    return [img1x1, img4x3, img16x9]
+class HeadParser(HTMLParser):
+    """
+    Collects the SEO tags of an HTML document, and stops at the end of its
+    ``<head>``. Tags are collected into ``tags``, keeping the first of each:
+
+    * ``title``: text of the ``<title>`` tag.
+    * ``icon`` and ``canonical``: ``href`` of the matching ``<link>`` tag.
+    * ``content`` of each ``<meta>`` tag, keyed by its ``property`` or
+      ``name`` with colons replaced by underscores, e.g. ``description``,
+      ``og_title``, ``twitter_card``.
+    """
+
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.tags: Dict[str, str] = {}
+        self.done = False
+        self._title: Optional[List[str]] = None
+
+    def handle_starttag(self, tag, attrs):
+        if tag == "body":
+            self.done = True
+            return
+        attrs = dict(attrs)
+        if tag == "title":
+            self._title = []
+        elif tag == "link" and attrs.get("href"):
+            rels = (attrs.get("rel") or "").lower().split()
+            for rel in ("icon", "canonical"):
+                if rel in rels:
+                    self.tags.setdefault(rel, attrs["href"])
+        elif tag == "meta" and attrs.get("content") is not None:
+            key = attrs.get("property") or attrs.get("name")
+            if key:
+                key = key.lower().replace(":", "_")
+                self.tags.setdefault(key, attrs["content"])
+
+    def handle_endtag(self, tag):
+        if tag == "head":
+            self.done = True
+        elif tag == "title" and self._title is not None:
+            self.tags.setdefault("title", "".join(self._title).strip())
+            self._title = None
+
+    def handle_data(self, data):
+        if self._title is not None:
+            self._title.append(data)
+
+
+def get_head_tags(
+    response: HttpResponseBase, chunk_size: int = 8192
+) -> Dict[str, str]:
+    """
+    Scans the content of a rendered response until the end of its ``<head>``,
+    without parsing the rest of the document.
+
+    :param HttpResponse response: A rendered HTML response.
+    :param int chunk_size: Number of bytes parsed at a time.
+    :rtype: Dict[str, str]
+    :returns: The tags collected by ``HeadParser``.
+    """
+    if response.streaming:
+        chunks = response.streaming_content
+    else:
+        content = response.content
+        chunks = (
+            content[i : i + chunk_size]
+            for i in range(0, len(content), chunk_size)
+        )
+    decoder = codecs.getincrementaldecoder(response.charset)(errors="replace")
+    parser = HeadParser()
+    for chunk in chunks:
+        parser.feed(decoder.decode(chunk))
+        if parser.done:
+            break
+    else:
+        parser.feed(decoder.decode(b"", final=True))
+        parser.close()
+    return parser.tags
 
 
 class StructDataEncoder(JSONEncoder):
@@ -103,3 +223,80 @@ class StructDataEncoder(JSONEncoder):
 
         # Fallback to default encoding.
         return super().default(obj)
+
+
+_struct_data_encoder = StructDataEncoder(
+    ensure_ascii=False, separators=(",", ":")
+)
+
+
+def get_json_backend() -> str:
+    """
+    Gets the library used to serialize structured data, as set by
+    ``WAGTAILSEO_JSON_BACKEND``.
+
+    :rtype: str
+    :returns: ``"orjson"`` or ``"json"``.
+    """
+    backend = seo_settings.get("WAGTAILSEO_JSON_BACKEND")
+    if backend == "auto":
+        return "json" if orjson is None else "orjson"
+    if backend == "orjson" and orjson is None:
+        raise ImproperlyConfigured(
+            "WAGTAILSEO_JSON_BACKEND is 'orjson', but orjson is not installed."
+        )
+    if backend not in ("json", "orjson"):
+        raise ImproperlyConfigured(
+            "WAGTAILSEO_JSON_BACKEND must be 'auto', 'json' or 'orjson', "
+            "not {0!r}.".format(backend)
+        )
+    return backend
+
+
+def dumps_struct_data(obj) -> str:
+    """
+    Serializes structured data into compact JSON, with dates and times in
+    ISO 8601 format. The output is the same with either JSON backend.
+
+    :param obj: The structured data to serialize.
+    :rtype: str
+    :returns: JSON string.
+    """
+    if get_json_backend() == "orjson":
+        return orjson.dumps(
+            obj,
+            default=_struct_data_encoder.default,
+            option=orjson.OPT_PASSTHROUGH_DATETIME,
+        ).decode("utf8")
+    return _struct_data_encoder.encode(obj)
+
+
+@functools.lru_cache(maxsize=256)
+def parse_json_object(text: str) -> Optional[dict]:
+    """
+    Parses additional JSON-LD entered by an editor. Each distinct text is only
+    parsed once per process, and the result is shared between callers, so it
+    must not be modified.
+
+    :param str text: The JSON text.
+    :rtype: Optional[dict]
+    :returns: The parsed object, or ``None`` if ``text`` is not a valid JSON
+        object.
+    """
+    try:
+        value = loads(text)
+    except ValueError:
+        value = None
+    if not isinstance(value, dict):
+        logger.warning("Ignoring invalid additional JSON-LD: %.100r", text)
+        return None
+    return value
+
+
+def validate_json_object(text: str) -> None:
+    """
+    Raises ``ValidationError`` if ``text`` is not empty and not a valid JSON
+    object.
+    """
+    if text and parse_json_object(text) is None:
+        raise ValidationError(_("Enter a valid JSON object."), code="invalid")
@@ -0,0 +1,113 @@
+"""
+SEO report in the Wagtail admin.
+"""
+
+import datetime
+
+import django_filters
+from django.urls import reverse
+from django.utils.translation import gettext_lazy as _
+from wagtail.admin.filters import WagtailFilterSet
+from wagtail.admin.ui.tables import Column
+from wagtail.admin.ui.tables import StatusFlagColumn
+from wagtail.admin.ui.tables import TitleColumn
+from wagtail.admin.views.reports import ReportView
+from wagtail.coreutils import get_content_type_label
+from wagtail.models import Page
+from wagtail.permissions import page_permission_policy
+
+from wagtailseo import audit
+
+
+class SeoReportFilterSet(WagtailFilterSet):
+    rule = django_filters.ChoiceFilter(
+        label=_("Warning"),
+        choices=[
+            ("title", _("Title too long")),
+            ("description", _("Description too short or too long")),
+            ("image", _("No preview image")),
+        ],
+        method="filter_rule",
+        empty_label=_("Any"),
+    )
+
+    class Meta:
+        model = Page
+        fields = ["rule", "live"]
+
+    def filter_rule(self, queryset, name, value):
+        return queryset.filter(audit.get_warning_q(value))
+
+
+class SeoReportView(ReportView):
+    """
+    Lists pages failing the title, description, or preview image checks of the
+    "SEO Preview" mode. Every check runs in the database.
+    """
+
+    page_title = _("SEO warnings")
+    header_icon = "wagtailseo-line-chart"
+    filterset_class = SeoReportFilterSet
+    index_url_name = "wagtailseo_report"
+    index_results_url_name = "wagtailseo_report_results"
+    permission_policy = page_permission_policy
+    any_permission_required = ["add", "change", "publish"]
+    default_ordering = "title"
+    columns = [
+        TitleColumn(
+            "title",
+            label=_("Title"),
+            sort_key="title",
+            get_url=lambda page: reverse(
+                "wagtailadmin_pages:edit", args=[page.pk]
+            ),
+        ),
+        Column(
+            "seo_title_length",
+            label=_("Title length"),
+            sort_key="seo_title_length",
+        ),
+        Column(
+            "seo_description_length",
+            label=_("Description length"),
+            sort_key="seo_description_length",
+        ),
+        StatusFlagColumn(
+            "seo_missing_image",
+            label=_("Preview image"),
+            true_label=_("Missing"),
+            sort_key="seo_missing_image",
+        ),
+        Column(
+            "content_type",
+            label=_("Type"),
+            accessor=lambda page: get_content_type_label(page.content_type),
+        ),
+    ]
+    list_export = [
+        "title",
+        "seo_title_length",
+        "seo_description_length",
+        "seo_missing_image",
+    ]
+    export_headings = {
+        "seo_title_length": _("Title length"),
+        "seo_description_length": _("Description length"),
+        "seo_missing_image": _("No preview image"),
+    }
+
+    def get_filename(self):
+        return "seo-warnings-report-{0}".format(
+            datetime.date.today().strftime("%Y-%m-%d")
+        )
+
+    def get_base_queryset(self):
+        pages = page_permission_policy.instances_user_has_permission_for(
+            self.request.user, "change"
+        )
+        pages = pages & audit.get_seo_pages()
+        return (
+            audit.annotate_warnings(pages)
+            .filter(audit.get_warning_q())
+            .select_related("content_type")
+        )
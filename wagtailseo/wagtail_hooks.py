@@ -1,8 +1,13 @@
 """
-Registers wagtail-seo icon in the admin dashboard.
+Registers wagtail-seo icon and SEO report in the admin dashboard.
 """
 
+from django.urls import path
+from django.urls import reverse
+from django.utils.translation import gettext_lazy as _
+from wagtail import VERSION as WAG_VERSION
 from wagtail import hooks
+from wagtail.admin.menu import MenuItem
 
 
 @hooks.register("register_icons")
@@ -15,3 +20,33 @@ def register_icons(icons):
     # https://github.com/wagtail/wagtail/pull/6028
     icons.append("wagtailseo/wagtailseo-line-chart.svg")
     return icons
+
+
+# The SEO report uses the listing views introduced in Wagtail 6.1.
+if WAG_VERSION >= (6, 1):
+    from wagtailseo.views import SeoReportView
+
+    @hooks.register("register_admin_urls")
+    def register_report_urls():
+        return [
+            path(
+                "reports/seo/",
+                SeoReportView.as_view(),
+                name="wagtailseo_report",
+            ),
+            path(
+                "reports/seo/results/",
+                SeoReportView.as_view(results_only=True),
+                name="wagtailseo_report_results",
+            ),
+        ]
+
+    @hooks.register("register_reports_menu_item")
+    def register_report_menu_item():
+        return MenuItem(
+            _("SEO warnings"),
+            reverse("wagtailseo_report"),
+            name="seo-warnings",
+            icon_name="wagtailseo-line-chart",
+            order=1000,
+        )